@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""Function that calculates the log-likelihood of
+obtaining this data given various hypothetical
+probabilities of developing severe side effects"""
+
+import numpy as np
+from scipy.special import gammaln, xlog1py, xlogy
+
+
+def log_likelihood(x, n, P):
+    """Function that calculates the log-likelihood of
+    obtaining this data given various hypothetical
+    probabilities of developing severe side effects
+
+    The binomial coefficient is computed with gammaln instead of
+    factorials, so the result stays finite for very large n"""
+    if type(n) is not int or n <= 0:
+        raise ValueError("n must be a positive integer")
+    if type(x) is not int or x < 0:
+        text = "x must be an integer that is greater than or equal to 0"
+        raise ValueError(text)
+    if x > n:
+        raise ValueError("x cannot be greater than n")
+    if (not isinstance(P, np.ndarray)) or len(P.shape) != 1:
+        raise TypeError("P must be a 1D numpy.ndarray")
+    if np.any(P < 0) or np.any(P > 1):
+        raise ValueError("All values in P must be in the range [0, 1]")
+    log_coeficient = gammaln(n + 1) - gammaln(x + 1) - gammaln(n - x + 1)
+    return log_coeficient + xlogy(x, P) + xlog1py(n - x, -P)
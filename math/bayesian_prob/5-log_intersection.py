@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Function that calculates the log of the intersection
+of obtaining this data with the various hypothetical probabilities"""
+
+import numpy as np
+log_likelihood = __import__('4-log_likelihood').log_likelihood
+
+
+def log_intersection(x, n, P, Pr):
+    """Function that calculates the log of the intersection
+    of obtaining this data with the various hypothetical probabilities"""
+    if type(n) is not int or n <= 0:
+        raise ValueError("n must be a positive integer")
+    if type(x) is not int or x < 0:
+        text = "x must be an integer that is greater than or equal to 0"
+        raise ValueError(text)
+    if x > n:
+        raise ValueError("x cannot be greater than n")
+    if (not isinstance(P, np.ndarray)) or len(P.shape) != 1:
+        raise TypeError("P must be a 1D numpy.ndarray")
+    if (not isinstance(Pr, np.ndarray)) or Pr.shape != P.shape:
+        raise TypeError("Pr must be a numpy.ndarray with the same shape as P")
+    if np.any(P < 0) or np.any(P > 1):
+        raise ValueError("All values in P must be in the range [0, 1]")
+    if np.any(Pr < 0) or np.any(Pr > 1):
+        raise ValueError("All values in Pr must be in the range [0, 1]")
+    if not np.isclose([np.sum(Pr)], [1.])[0]:
+        raise ValueError("Pr must sum to 1")
+    with np.errstate(divide='ignore'):
+        log_prior = np.log(Pr)
+    return log_likelihood(x, n, P) + log_prior
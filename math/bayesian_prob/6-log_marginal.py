@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+""""Function that calculates the log of the marginal
+probability of obtaining the data"""
+
+from scipy.special import logsumexp
+log_intersection = __import__('5-log_intersection').log_intersection
+
+
+def log_marginal(x, n, P, Pr):
+    """"Function that calculates the log of the marginal
+    probability of obtaining the data"""
+    return logsumexp(log_intersection(x, n, P, Pr))
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+""""Function that calculates the posterior probability
+for the various hypothetical probabilities of developing
+severe side effects given the data, working in log space"""
+
+import numpy as np
+from scipy.special import logsumexp
+log_intersection = __import__('5-log_intersection').log_intersection
+
+
+def stable_posterior(x, n, P, Pr):
+    """"Function that calculates the posterior probability
+    for the various hypothetical probabilities of developing
+    severe side effects given the data, working in log space
+
+    Same result as posterior, but it does not underflow to 0
+    when the likelihood is tiny for every value of P"""
+    log_inter = log_intersection(x, n, P, Pr)
+    return np.exp(log_inter - logsumexp(log_inter))
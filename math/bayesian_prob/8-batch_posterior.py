@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+""""Function that calculates the posterior probability
+for the various hypothetical probabilities of developing
+severe side effects for many observations at once"""
+
+import numpy as np
+
+
+def batch_posterior(x, n, P, Pr):
+    """"Function that calculates the posterior probability
+    for the various hypothetical probabilities of developing
+    severe side effects for many observations at once
+
+    x and n are 1D numpy.ndarrays of integers holding one
+    observation per cohort, P and Pr are validated only once and
+    the result is a numpy.ndarray of shape (len(x), len(P)) whose
+    row i is the posterior of observation (x[i], n[i])"""
+    if (not isinstance(n, np.ndarray)) or len(n.shape) != 1 or \
+            not np.issubdtype(n.dtype, np.integer):
+        raise TypeError("n must be a 1D numpy.ndarray of integers")
+    if (not isinstance(x, np.ndarray)) or x.shape != n.shape or \
+            not np.issubdtype(x.dtype, np.integer):
+        raise TypeError("x must be a numpy.ndarray of integers "
+                        "with the same shape as n")
+    if np.any(n <= 0):
+        raise ValueError("All values in n must be positive integers")
+    if np.any(x < 0):
+        raise ValueError("All values in x must be greater than or equal to 0")
+    if np.any(x > n):
+        raise ValueError("x cannot be greater than n")
+    if (not isinstance(P, np.ndarray)) or len(P.shape) != 1:
+        raise TypeError("P must be a 1D numpy.ndarray")
+    if (not isinstance(Pr, np.ndarray)) or Pr.shape != P.shape:
+        raise TypeError("Pr must be a numpy.ndarray with the same shape as P")
+    if np.any(P < 0) or np.any(P > 1):
+        raise ValueError("All values in P must be in the range [0, 1]")
+    if np.any(Pr < 0) or np.any(Pr > 1):
+        raise ValueError("All values in Pr must be in the range [0, 1]")
+    if not np.isclose([np.sum(Pr)], [1.])[0]:
+        raise ValueError("Pr must sum to 1")
+
+    failures = (n - x)[:, np.newaxis].astype(float)
+    successes = x[:, np.newaxis].astype(float)
+    log_p = np.log(P, out=np.zeros(P.shape), where=P > 0)
+    log_q = np.log1p(-P, out=np.zeros(P.shape), where=P < 1)
+    with np.errstate(divide='ignore'):
+        log_prior = np.log(Pr)
+
+    # the binomial coefficient is constant along each row and
+    # cancels out in the normalization, so it is never computed
+    log_inter = successes * log_p
+    log_inter += failures * log_q
+    log_inter += log_prior
+    log_inter[np.ix_(x > 0, P == 0)] = -np.inf
+    log_inter[np.ix_(x < n, P == 1)] = -np.inf
+
+    log_inter -= np.max(log_inter, axis=1, keepdims=True)
+    np.exp(log_inter, out=log_inter)
+    log_inter /= np.sum(log_inter, axis=1, keepdims=True)
+    return log_inter
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Creates the BayesUpdater class
+"""
+import numpy as np
+from scipy.special import betaln, logsumexp, xlog1py, xlogy
+
+
+class BayesUpdater:
+    """
+    Sequential Bayesian updater for the probability of developing
+    severe side effects, folding in new batches of trials as they come
+
+    Works in one of two modes:
+        grid mode, given the hypothetical probabilities P and their
+        prior Pr, keeps the normalized log posterior over the grid
+        conjugate mode, given the parameters alpha and beta of a Beta
+        prior, keeps the Beta posterior and updates it in O(1)
+    """
+
+    def __init__(self, P=None, Pr=None, alpha=None, beta=None):
+        """
+        class constructor
+        :param P: 1D numpy.ndarray containing the various hypothetical
+            probabilities of developing severe side effects
+        :param Pr: 1D numpy.ndarray containing the prior beliefs of P
+        :param alpha: first parameter of a Beta prior, used when P is None
+        :param beta: second parameter of a Beta prior, used when P is None
+        """
+        self.conjugate = P is None
+        if self.conjugate:
+            if alpha is None or beta is None:
+                raise TypeError("either P and Pr or alpha and beta "
+                                "must be given")
+            if alpha <= 0 or beta <= 0:
+                raise ValueError("alpha and beta must be positive")
+            self.alpha = float(alpha)
+            self.beta = float(beta)
+            return
+
+        if (not isinstance(P, np.ndarray)) or len(P.shape) != 1:
+            raise TypeError("P must be a 1D numpy.ndarray")
+        if (not isinstance(Pr, np.ndarray)) or Pr.shape != P.shape:
+            raise TypeError("Pr must be a numpy.ndarray with the same shape "
+                            "as P")
+        if np.any(P < 0) or np.any(P > 1):
+            raise ValueError("All values in P must be in the range [0, 1]")
+        if np.any(Pr < 0) or np.any(Pr > 1):
+            raise ValueError("All values in Pr must be in the range [0, 1]")
+        if not np.isclose([np.sum(Pr)], [1.])[0]:
+            raise ValueError("Pr must sum to 1")
+        self.P = P
+        self.__zero = P == 0
+        self.__one = P == 1
+        self.__log_p = np.log(P, out=np.zeros(P.shape), where=~self.__zero)
+        self.__log_q = np.log1p(-P, out=np.zeros(P.shape), where=~self.__one)
+        with np.errstate(divide='ignore'):
+            self.log_posterior = np.log(Pr)
+
+    def update(self, x, n):
+        """
+        folds a new batch of trials into the posterior
+        :param x: number of patients that develop severe side effects
+        :param n: total number of patients observed in the batch
+        """
+        if type(n) is not int or n <= 0:
+            raise ValueError("n must be a positive integer")
+        if type(x) is not int or x < 0:
+            text = "x must be an integer that is greater than or equal to 0"
+            raise ValueError(text)
+        if x > n:
+            raise ValueError("x cannot be greater than n")
+
+        if self.conjugate:
+            self.alpha += x
+            self.beta += n - x
+            return
+
+        log_post = self.log_posterior
+        log_post += x * self.__log_p
+        log_post += (n - x) * self.__log_q
+        if x > 0:
+            log_post[self.__zero] = -np.inf
+        if x < n:
+            log_post[self.__one] = -np.inf
+        log_post -= logsumexp(log_post)
+
+    def posterior(self, P=None):
+        """
+        calculates the current posterior
+        :param P: 1D numpy.ndarray of probabilities where the Beta
+            posterior density is evaluated, only used in conjugate mode
+        :return: in grid mode, the posterior probability of each value
+            of the grid, in conjugate mode, the Beta posterior density at P
+        """
+        if not self.conjugate:
+            return np.exp(self.log_posterior)
+        if (not isinstance(P, np.ndarray)) or len(P.shape) != 1:
+            raise TypeError("P must be a 1D numpy.ndarray")
+        if np.any(P < 0) or np.any(P > 1):
+            raise ValueError("All values in P must be in the range [0, 1]")
+        a, b = self.alpha, self.beta
+        log_pdf = xlogy(a - 1, P) + xlog1py(b - 1, -P) - betaln(a, b)
+        return np.exp(log_pdf)
+
+    def mean(self):
+        """
+        calculates the posterior mean of the probability of developing
+        severe side effects
+        :return: the posterior mean
+        """
+        if self.conjugate:
+            return self.alpha / (self.alpha + self.beta)
+        return float(np.sum(self.P * np.exp(self.log_posterior)))
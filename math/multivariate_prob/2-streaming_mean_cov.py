@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Functions that calculate the mean and covariance of a data set
+that does not fit in memory, one chunk of rows at a time"""
+
+import numpy as np
+
+
+def _chunks(X, chunk_size):
+    """Function that yields the row chunks of X, a 2D numpy.ndarray
+    (or numpy.memmap) sliced in blocks of chunk_size rows, or any
+    iterable of 2D numpy.ndarrays"""
+    if isinstance(X, np.ndarray):
+        if len(X.shape) != 2:
+            raise TypeError("X must be a 2D numpy.ndarray")
+        for start in range(0, X.shape[0], chunk_size):
+            yield X[start:start + chunk_size]
+        return
+    for chunk in X:
+        if not isinstance(chunk, np.ndarray) or len(chunk.shape) != 2:
+            raise TypeError("X must be a 2D numpy.ndarray")
+        yield chunk
+
+
+def merge_partials(a, b):
+    """Function that merges two partial results (n, mean, M2) of
+    disjoint sets of rows into the partial result of their union
+
+    M2 is the (d, d) matrix of summed co-moments around the mean;
+    the merge follows the parallel update of Chan et al., which
+    stays stable when the two means are far apart"""
+    n_a, mean_a, M2_a = a
+    n_b, mean_b, M2_b = b
+    if n_a == 0:
+        return b
+    if n_b == 0:
+        return a
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (n_b / n)
+    M2 = M2_a + M2_b + np.dot(delta.T, delta) * (n_a * n_b / n)
+    return (n, mean, M2)
+
+
+def partial_mean_cov(X, chunk_size=65536):
+    """Function that calculates the partial result (n, mean, M2)
+    of a data set given as a 2D numpy.ndarray or numpy.memmap, read
+    chunk_size rows at a time, or as an iterable of row chunks
+
+    Partial results of different shards can be combined with
+    merge_partials and turned into (mean, C) with finalize_mean_cov"""
+    partial = (0, None, None)
+    for chunk in _chunks(X, chunk_size):
+        n = chunk.shape[0]
+        if n == 0:
+            continue
+        mean = np.mean(chunk, axis=0, keepdims=True)
+        centered = chunk - mean
+        partial = merge_partials(partial, (n, mean, np.dot(centered.T,
+                                                           centered)))
+    return partial
+
+
+def finalize_mean_cov(partial):
+    """Function that turns a partial result (n, mean, M2) into the
+    same (mean, C) pair as mean_cov"""
+    n, mean, M2 = partial
+    if n < 2:
+        raise ValueError("X must contain multiple data points")
+    return (mean, M2 / (n - 1))
+
+
+def streaming_mean_cov(X, chunk_size=65536):
+    """Function that calculates the mean and covariance of a data set
+    without loading it in memory at once, see partial_mean_cov"""
+    return finalize_mean_cov(partial_mean_cov(X, chunk_size))
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""Function that calculates a correlation matrix from the
+partial results of several shards of a data set"""
+
+from functools import reduce
+correlation = __import__('1-correlation').correlation
+streaming = __import__('2-streaming_mean_cov')
+
+
+def merged_correlation(partials):
+    """Function that calculates the correlation matrix of a data set
+    from the partial results (n, mean, M2) computed on its shards,
+    possibly by different processes, with partial_mean_cov"""
+    merged = reduce(streaming.merge_partials, partials, (0, None, None))
+    mean, C = streaming.finalize_mean_cov(merged)
+    return correlation(C)
@@ -3,6 +3,7 @@
 Creates the MultiNormal class
 """
 import numpy as np
+from scipy.linalg import solve_triangular
 
 
 class MultiNormal:
@@ -28,26 +29,79 @@ class MultiNormal:
         self.mean = data.mean(axis=1).reshape(d, 1)
         X_mean = data - self.mean
         self.cov = (X_mean @ X_mean.T) / (n - 1)
+        # Cholesky factor of cov, computed by the first logpdf or rvs so
+        # a singular covariance only fails there
+        self.__L = None
+        self.__log_det = None
+
+    def __cholesky(self):
+        """
+        returns the Cholesky factor of the covariance, factorising it on
+        the first call
+        :return: lower triangular numpy.ndarray L with L @ L.T == cov
+        """
+        if self.__L is None:
+            self.__L = np.linalg.cholesky(self.cov)
+            self.__log_det = 2 * np.sum(np.log(np.diag(self.__L)))
+        return self.__L
+
+    def logpdf(self, x):
+        """
+        calculates the log of the PDF, using the cached Cholesky factor of
+        the covariance
+        :param x: numpy.ndarray of shape (d, n) containing the data points
+        whose log PDF should be calculated
+            d is the number of dimensions of the Multinomial instance
+            n is the number of data points
+        :return: numpy.ndarray of shape (n,) with the log PDF of each point
+        """
+        if type(x) is not np.ndarray:
+            raise TypeError("x must be a numpy.ndarray")
+        d = self.cov.shape[0]
+        if len(x.shape) != 2 or x.shape[0] != d:
+            raise ValueError("x must have the shape ({}, n)".format(d))
+
+        z = solve_triangular(self.__cholesky(), x - self.mean, lower=True,
+                             check_finite=False)
+        maha = np.einsum('ij,ij->j', z, z)
+        return -0.5 * (d * np.log(2 * np.pi) + self.__log_det + maha)
 
     def pdf(self, x):
         """
         calculates the PDF
         :param x: numpy.ndarray of shape (d, 1) containing the data point whose
-        PDF should be calculated
+        PDF should be calculated, or of shape (d, n) for a batch of points
             d is the number of dimensions of the Multinomial instance
-        :return: the value of the PDF
+        :return: the value of the PDF, or a numpy.ndarray of shape (n,)
+        with the PDF of each point of the batch
         """
         if type(x) is not np.ndarray:
             raise TypeError("x must be a numpy.ndarray")
         d = self.cov.shape[0]
-        if len(x.shape) != 2 or x.shape[1] != 1 or x.shape[0] != d:
+        if len(x.shape) != 2 or x.shape[0] != d:
             raise ValueError("x must have the shape ({}, 1)".format(d))
+        pdf = np.exp(self.logpdf(x))
+        if x.shape[1] == 1:
+            return pdf[0]
+        return pdf
 
-        det = np.linalg.det(self.cov)
-        inv = np.linalg.inv(self.cov)
-        first = 1 / ((2 * np.pi) ** (d / 2) * np.sqrt(det))
-        second = np.dot((x - self.mean).T, inv)
-        third = np.dot(second, (x - self.mean) / -2)
-        pdf = first * np.exp(third)
-
-        return pdf[0][0]
+    def rvs(self, size=1, rng=None, dtype=np.float64):
+        """
+        draws samples from the distribution, reusing the cached Cholesky
+        factor of the covariance
+        :param size: number of samples to draw
+        :param rng: numpy.random.Generator, or a seed used to create one
+        :param dtype: numpy.float32 or numpy.float64, type of the samples
+        :return: numpy.ndarray of shape (d, size) containing the samples
+        """
+        if type(size) is not int or size < 1:
+            raise ValueError("size must be a positive integer")
+        if dtype not in (np.float32, np.float64):
+            raise TypeError("dtype must be numpy.float32 or numpy.float64")
+        if not isinstance(rng, np.random.Generator):
+            rng = np.random.default_rng(rng)
+        d = self.cov.shape[0]
+        z = rng.standard_normal((d, size), dtype=dtype)
+        samples = np.matmul(self.__cholesky().astype(dtype), z)
+        samples += self.mean.astype(dtype)
+        return samples
@@ -3,11 +3,12 @@
 # Importing libraries.
 import numpy as np
 import matplotlib.pyplot as plt
+downsample = __import__('7-downsample').downsample
 
 y = np.arange(0, 11) ** 3
 x = np.arange(0, 11)
 
-plt.plot(x, y, color='red')
+plt.plot(*downsample(x, y), color='red')
 
 # Illustrating x-axis, y-axis, and naming the title of graph.
 plt.xlabel('X-axis')
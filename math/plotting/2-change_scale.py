@@ -1,13 +1,14 @@
 #!/usr/bin/bash python3
 import numpy as np
 import matplotlib.pyplot as plt
+downsample = __import__('7-downsample').downsample
 
 x = np.arange(0, 28651, 5730)
 r = np.log(0.5)
 t = 5730
 y = np.exp((r / t) * x)
 
-plt.plot(x, y)
+plt.plot(*downsample(x, y))
 
 # Plot the axis labels.
 plt.title('Exponential Decay of C-14')
@@ -1,6 +1,7 @@
 #!/usr/bin/bash python3
 import numpy as np
 import matplotlib.pyplot as plt
+downsample = __import__('7-downsample').downsample
 
 x = np.arange(0, 21000, 1000)
 r = np.log(0.5)
@@ -9,8 +10,8 @@ t2 = 1600
 y1 = np.exp((r/t1)*x)
 y2 = np.exp((r/t2)*x)
 
-plt.plot(x, y1, color='red', linestyle='--')
-plt.plot(x, y2, color='green', linestyle='-')
+plt.plot(*downsample(x, y1), color='red', linestyle='--')
+plt.plot(*downsample(x, y2), color='green', linestyle='-')
 
 
 plt.title('Exponential Decay of Radioactive Elements')
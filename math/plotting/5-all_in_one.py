@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
 import matplotlib.ticker as ticker
+downsample = __import__('7-downsample').downsample
 
 plt.rcParams.update({'font.size': 8})
 
@@ -40,7 +41,7 @@ student_grades = np.random.normal(68, 15, 50)
 
 # plot 1
 ax1 = fig.add_subplot(gs[0, 0])
-ax1.plot(x0, y0, color='red')
+ax1.plot(*downsample(x0, y0), color='red')
 ax1.set_xlim(left=0, right=10)
 
 
@@ -54,7 +55,7 @@ ax2.set_xticks([60, 70, 80])
 
 # plot 3
 ax3 = fig.add_subplot(gs[1, 0])
-ax3.plot(x2, y2)
+ax3.plot(*downsample(x2, y2))
 ax3.set_title('Exponential Decay of C-14')
 ax3.set_xlabel('Time (years)')
 ax3.set_ylabel('Fraction Remaining')
@@ -64,8 +65,8 @@ ax3.set_xticks([10000, 20000])
 
 # plot 4
 ax4 = fig.add_subplot(gs[1, 1])
-ax4.plot(x3, y31, color='red', linestyle='--')
-ax4.plot(x3, y32, color='green')
+ax4.plot(*downsample(x3, y31), color='red', linestyle='--')
+ax4.plot(*downsample(x3, y32), color='green')
 
 ax4.set_title('Exponential Decay of Radioactive Elements')
 ax4.set_xlabel('Time (years)')
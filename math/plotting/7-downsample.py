@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Functions that downsample large series before plotting them"""
+
+import numpy as np
+
+
+def lttb(x, y, n_out):
+    """Function that downsamples the series (x, y) to n_out points with
+    the Largest-Triangle-Three-Buckets algorithm
+
+    The first and last points are kept; the points in between are split
+    into n_out - 2 buckets and, in each bucket, the point forming the
+    largest triangle with the previously kept point and the average of
+    the next bucket is kept, which preserves the visual shape"""
+    n = x.shape[0]
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[n - 1])
+    avg_y = np.append(sums_y / counts, y[n - 1])
+
+    kept = np.empty(n_out, dtype=int)
+    kept[0] = 0
+    kept[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        bx = x[start:stop]
+        by = y[start:stop]
+        area = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) -
+                      (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = start + np.argmax(area)
+        kept[i + 1] = a
+    return x[kept], y[kept]
+
+
+def minmax(x, y, n_out):
+    """Function that downsamples the series (x, y) to about n_out points
+    by keeping the minimum and the maximum of each of n_out // 2 buckets,
+    in their original order, so the envelope of the series is kept"""
+    n = x.shape[0]
+    buckets = max(n_out // 2, 1)
+    size = -(-n // buckets)
+    padded = np.pad(y, (0, buckets * size - n), mode='edge')
+    padded = padded.reshape(buckets, size)
+    offsets = np.arange(buckets)[:, np.newaxis] * size
+    lows = np.argmin(padded, axis=1)[:, np.newaxis] + offsets
+    highs = np.argmax(padded, axis=1)[:, np.newaxis] + offsets
+    kept = np.sort(np.concatenate((lows, highs), axis=1), axis=1).ravel()
+    kept = np.unique(np.minimum(kept, n - 1))
+    return x[kept], y[kept]
+
+
+def downsample(x, y, n_out=2000, mode='lttb'):
+    """Function that downsamples the series (x, y) to a fixed budget
+    of n_out points before handing it to matplotlib
+
+    mode is 'lttb' (Largest-Triangle-Three-Buckets) or 'minmax'
+    (min/max envelope); series already within budget are returned as is"""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if x.shape != y.shape or len(x.shape) != 1:
+        raise ValueError("x and y must be 1D arrays of the same length")
+    if mode not in ('lttb', 'minmax'):
+        raise ValueError("mode must be 'lttb' or 'minmax'")
+    if x.shape[0] <= n_out or n_out < 3:
+        return x, y
+    if mode == 'minmax':
+        return minmax(x, y, n_out)
+    return lttb(x, y, n_out)
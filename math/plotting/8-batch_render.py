@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Renders the plotting scripts to image files, headless and in parallel"""
+
+import glob
+import os
+import runpy
+import sys
+import time
+from multiprocessing import Pool
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+
+def render_figure(script, out_dir, formats=('png',)):
+    """Function that runs one plotting script under the Agg backend and
+    writes every figure it creates to out_dir, once per format
+
+    plt.show is replaced by a no-op while the script runs, so the script
+    itself does not need to change. Returns the script name, the list of
+    written paths and the render time in seconds"""
+    start = time.perf_counter()
+    name = os.path.splitext(os.path.basename(script))[0]
+    script_dir = os.path.dirname(os.path.abspath(script))
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    show = plt.show
+    plt.show = lambda *args, **kwargs: None
+    paths = []
+    try:
+        with matplotlib.rc_context():
+            runpy.run_path(script, run_name='__main__')
+            numbers = plt.get_fignums()
+            for i in numbers:
+                fig = plt.figure(i)
+                suffix = '' if len(numbers) == 1 else '-{}'.format(i)
+                for fmt in formats:
+                    path = os.path.join(out_dir, '{}{}.{}'.format(
+                        name, suffix, fmt))
+                    fig.savefig(path, format=fmt)
+                    paths.append(path)
+    finally:
+        plt.close('all')
+        plt.show = show
+    return name, paths, time.perf_counter() - start
+
+
+def _render(job):
+    """Function that unpacks a job for Pool.imap_unordered"""
+    return render_figure(*job)
+
+
+def batch_render(scripts, out_dir, formats=('png',), processes=None,
+                 verbose=True):
+    """Function that renders independent plotting scripts across a
+    process pool and writes the figures to out_dir
+
+    Returns a dictionary mapping each script name to its render time
+    in seconds, and prints one line per figure when verbose is True"""
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(script, out_dir, tuple(formats)) for script in scripts]
+    timings = {}
+    with Pool(processes) as pool:
+        for name, paths, seconds in pool.imap_unordered(_render, jobs):
+            timings[name] = seconds
+            if verbose:
+                print('{:<20} {:8.3f}s  {}'.format(name, seconds,
+                                                   ', '.join(paths)))
+    return timings
+
+
+if __name__ == '__main__':
+    here = os.path.dirname(os.path.abspath(__file__))
+    out = sys.argv[1] if len(sys.argv) > 1 else os.path.join(here, 'figures')
+    scripts = sorted(glob.glob(os.path.join(here, '[0-6]-*.py')))
+    timings = batch_render(scripts, out, formats=('png', 'svg'))
+    total = sum(timings.values())
+    print('total {:.3f}s for {} figures'.format(total, len(timings)))
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """ Defines Normal class that represents normal distribution """
 
+import numpy as np
+from scipy.special import ndtr, ndtri
+
 
 class Normal:
     """
@@ -34,6 +37,11 @@ class Normal:
             Computes the Cumulative Distribution Function (CDF) value
             at a given x (the probability that a random variable
             is less than or equal to x).
+
+        ppf(self, p):
+            Computes the Percent Point Function (inverse of the CDF)
+            at a given probability p (the x value below which a
+            fraction p of the distribution lies).
     """
 
     def __init__(self, data=None, mean=0., stddev=1.):
@@ -130,18 +138,38 @@ class Normal:
         """
         calculates the value of the CDF for a given x-value
 
+        The CDF of the z-score is scipy.special.ndtr, a double precision
+        erf/erfc evaluation that stays accurate far out in the tails.
+
         parameters:
-            x: x-value
+            x: x-value, a scalar or a numpy.ndarray of any shape
 
         return:
-            the CDF value for x
+            the CDF value for x (a float, or an array shaped like x)
         """
-        mean = self.mean
-        stddev = self.stddev
-        pi = 3.1415926536
-        value = (x - mean) / (stddev * (2 ** (1 / 2)))
-        erf = value - ((value ** 3) / 3) + ((value ** 5) / 10)
-        erf = erf - ((value ** 7) / 42) + ((value ** 9) / 216)
-        erf *= (2 / (pi ** (1 / 2)))
-        cdf = (1 / 2) * (1 + erf)
+        cdf = ndtr(self.z_score(np.asarray(x, dtype=float)))
+        if cdf.ndim == 0:
+            return float(cdf)
         return cdf
+
+    def ppf(self, p):
+        """
+        calculates the x-value for a given cumulative probability
+
+        The z-score is scipy.special.ndtri (Cephes), the inverse of ndtr,
+        accurate to double precision.
+
+        parameters:
+            p: probability, a scalar or a numpy.ndarray of any shape
+               with all values in the range [0, 1]
+
+        return:
+            the x-value for p (a float, or an array shaped like p)
+        """
+        p = np.asarray(p, dtype=float)
+        if np.any(p < 0) or np.any(p > 1):
+            raise ValueError("All values in p must be in the range [0, 1]")
+        x = self.x_value(ndtri(p))
+        if x.ndim == 0:
+            return float(x)
+        return x
@@ -3,7 +3,10 @@
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
+
+TrainingHistory = __import__('32-training_history').TrainingHistory
+batches = __import__('33-batching').batches
+evaluate_stream = __import__('33-batching').evaluate_stream
 
 
 class NeuralNetwork:
@@ -11,12 +14,15 @@ class NeuralNetwork:
         binary classification.
     """
 
-    def __init__(self, nx, nodes):
+    def __init__(self, nx, nodes, dtype=np.float64):
         """ Instantiation function
 
         Args:
             nx (int): size of the input layer
             nodes (_type_): _description_
+            dtype (type, optional): numpy.float32 or numpy.float64, type of
+                                    the weights, activations and gradients.
+                                    Defaults to numpy.float64.
         """
         if not isinstance(nx, int):
             raise TypeError('nx must be an integer')
@@ -27,15 +33,24 @@ class NeuralNetwork:
             raise TypeError('nodes must be an integer')
         if nodes < 1:
             raise ValueError('nodes must be a positive integer')
+        if dtype not in (np.float32, np.float64):
+            raise TypeError('dtype must be numpy.float32 or numpy.float64')
 
-        self.__W1 = np.random.randn(nodes, nx)
-        self.__b1 = np.zeros((nodes, 1))
+        self.__dtype = np.dtype(dtype)
+        self.__W1 = np.random.randn(nodes, nx).astype(self.__dtype)
+        self.__b1 = np.zeros((nodes, 1), dtype=self.__dtype)
         self.__A1 = 0
-        self.__W2 = np.random.randn(1, nodes)
+        self.__W2 = np.random.randn(1, nodes).astype(self.__dtype)
         self.__b2 = 0
         self.__A2 = 0
+        self.__history = None
 
     # getter functions
+    @property
+    def dtype(self):
+        """Return the floating point type of the parameters"""
+        return self.__dtype
+
     @property
     def W1(self):
         """Return weights vector for hidden layer"""
@@ -66,12 +81,18 @@ class NeuralNetwork:
         """Return activated output for the output neuron"""
         return self.__A2
 
+    @property
+    def history(self):
+        """Return the TrainingHistory of the last call to train"""
+        return self.__history
+
     def forward_prop(self, X):
         """ Calculates the forward propagation of the neural network
 
         Args:
             X (numpy.array): Input data with shape (nx, m)
         """
+        X = X.astype(self.__dtype, copy=False)
         z = np.matmul(self.__W1, X) + self.__b1
         sigmoid = 1 / (1 + np.exp(-z))
         self.__A1 = sigmoid
@@ -87,6 +108,9 @@ class NeuralNetwork:
             Y (_type_): _description_
             A (_type_): _description_
         """
+        # always in float64 so float32 activations neither lose the
+        # 1.0000001 margin nor round the sum
+        A = np.asarray(A, dtype=np.float64)
         loss = -(Y * np.log(A) + (1 - Y) * np.log(1.0000001 - A))
         cost = np.mean(loss)
         return cost
@@ -101,6 +125,78 @@ class NeuralNetwork:
         self.forward_prop(X)
         return np.where(self.__A2 >= 0.5, 1, 0), self.cost(Y, self.__A2)
 
+    def evaluate_stream(self, X, Y=None, batch_size=65536):
+        """ Evaluate the neural network on data that does not fit in memory,
+            one chunk at a time, see 33-batching.py
+
+        Args:
+            X (numpy.ndarray or iterable): input data of shape (nx, m),
+                                           typically a numpy.memmap, or
+                                           an iterable of (X_chunk,
+                                           Y_chunk) pairs when Y is None
+            Y (numpy.ndarray, optional): labels of shape (1, m)
+            batch_size (int, optional): number of examples per chunk when
+                                        X and Y are arrays.
+                                        Defaults to 65536.
+
+        Returns:
+            tuple: the cost and the accuracy over all the examples
+        """
+        return evaluate_stream(self.evaluate, X, Y, batch_size)
+
+    def predict(self, X, batch_size=None, probabilities=False):
+        """ Predict without labels and without keeping A1 and A2,
+            streaming X in chunks
+
+        Args:
+            X (numpy.array): Input data with shape (nx, m)
+            batch_size (int, optional): number of examples per chunk.
+                                        Defaults to None (all at once).
+            probabilities (bool, optional): return the output of the
+                                            network instead of the labels.
+                                            Defaults to False.
+
+        Returns:
+            numpy.array: predicted labels (1 or 0), or probabilities,
+                         of shape (1, m)
+        """
+        m = X.shape[1]
+        if batch_size is None:
+            batch_size = m
+        if not isinstance(batch_size, int):
+            raise TypeError('batch_size must be an integer')
+        if batch_size < 1:
+            raise ValueError('batch_size must be positive')
+        batch_size = max(min(batch_size, m), 1)
+        if probabilities:
+            result = np.empty((1, m), self.__dtype)
+        else:
+            result = np.empty((1, m), dtype=int)
+        hidden = np.empty((self.__W1.shape[0], batch_size), self.__dtype)
+        out = np.empty((1, batch_size), self.__dtype)
+
+        for start in range(0, m, batch_size):
+            chunk = X[:, start:start + batch_size].astype(self.__dtype,
+                                                          copy=False)
+            n = chunk.shape[1]
+            A1 = hidden[:, :n]
+            z = out[:, :n]
+            for A_prev, W, b, A in ((chunk, self.__W1, self.__b1, A1),
+                                    (A1, self.__W2, self.__b2, z)):
+                np.matmul(W, A_prev, out=A)
+                A += b
+                # sigmoid function: 1 / (1 + exp(-z))
+                np.negative(A, out=A)
+                np.exp(A, out=A)
+                A += 1
+                np.reciprocal(A, out=A)
+            if probabilities:
+                result[:, start:start + n] = z
+            else:
+                np.greater_equal(z, 0.5, out=result[:, start:start + n],
+                                 casting='unsafe')
+        return result
+
     def gradient_descent(self, X, Y, A1, A2, alpha=0.05):
         """ Calculates one pass of gradient descent on the neural network
 
@@ -124,7 +220,8 @@ class NeuralNetwork:
         self.__b1 -= alpha * db1
 
     def train(self, X, Y, iterations=1000, alpha=0.05,
-              verbose=True, graph=True, step=100):
+              verbose=True, graph=True, step=100, batch_size=None,
+              shuffle=False):
         """ Trains the neural network
 
         Args:
@@ -133,8 +230,17 @@ class NeuralNetwork:
             iterations (int, optional): _description_. Defaults to 5000.
             alpha (float, optional): _description_. Defaults to 0.05.
             verbose (bool, optional): _description_. Defaults to True.
-            graph (bool, optional): _description_. Defaults to True.
+            graph (bool or str, optional): show the training curve with
+                                           pyplot, or render it in the
+                                           background to this image path.
+                                           Defaults to True.
             step (int, optional): _description_. Defaults to 100.
+            batch_size (int, optional): number of examples per mini-batch,
+                                        each iteration is then one epoch over
+                                        all the mini-batches. Defaults to None
+                                        (full-batch gradient descent).
+            shuffle (bool, optional): shuffle the mini-batches every epoch.
+                                      Defaults to False.
         """
         if not isinstance(iterations, int):
             raise TypeError('iterations must be an integer')
@@ -151,23 +257,31 @@ class NeuralNetwork:
                 raise TypeError('step must be an integer')
             if step < 1 or step > iterations:
                 raise ValueError('step must be positive and <= iterations')
+        if batch_size is not None:
+            if not isinstance(batch_size, int):
+                raise TypeError('batch_size must be an integer')
+            if batch_size < 1:
+                raise ValueError('batch_size must be positive')
 
-        costs = []
-        steps = []
+        X = X.astype(self.__dtype, copy=False)
+        Y = Y.astype(self.__dtype, copy=False)
+        self.__history = TrainingHistory()
+        m = X.shape[1]
         for i in range(iterations + 1):
-            self.forward_prop(X)
-            cost = self.cost(Y, self.__A2)
+            cost = 0
+            for batch in batches(m, batch_size, shuffle):
+                X_batch = X[:, batch]
+                Y_batch = Y[:, batch]
+                self.forward_prop(X_batch)
+                cost += self.cost(Y_batch, self.__A2) * Y_batch.shape[1] / m
+                self.gradient_descent(X_batch, Y_batch, self.__A1,
+                                      self.__A2, alpha)
             if i % step == 0:
                 if verbose:
                     print('Cost after {} iterations: {}'.format(i, cost))
-                if graph:
-                    costs.append(cost)
-                    steps.append(i)
-            self.gradient_descent(X, Y, self.__A1, self.__A2, alpha)
-        if graph:
-            plt.plot(steps, costs, 'b')
-            plt.xlabel('iteration')
-            plt.ylabel('cost')
-            plt.title('Training Cost')
-            plt.show()
+                self.__history.append(i, cost)
+        if isinstance(graph, str):
+            self.__history.render(graph)
+        elif graph:
+            self.__history.show()
         return self.evaluate(X, Y)
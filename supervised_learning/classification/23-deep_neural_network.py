@@ -3,7 +3,6 @@
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 
 
 class DeepNeuralNetwork:
@@ -184,6 +183,8 @@ class DeepNeuralNetwork:
                 costs.append(cost)
                 print('Cost after {} iterations: {}'.format(i, cost))
         if graph:
+            import matplotlib.pyplot as plt
+
             plt.plot(np.arange(0, iterations, step), costs)
             plt.xlabel('iteration')
             plt.ylabel('cost')
@@ -7,18 +7,28 @@
 import numpy as np
 
 
-def one_hot_encode(Y, classes):
+def one_hot_encode(Y, classes, sparse=False):
     """Converts a numeric label vector into a one-hot matrix
 
     Args:
         Y (_type_): _description_
         classes (_type_): _description_
+        sparse (bool, optional): return the sparse form instead: the
+                                 index of the hot row of each column, shape
+                                 (m,), which DeepNeuralNetwork.cost and
+                                 gradient_descent accept in place of the
+                                 dense (classes, m) matrix.
+                                 Defaults to False.
     """
     if not isinstance(Y, np.ndarray) or len(Y) == 0:
         return None
     if not isinstance(classes, int) or classes < 0:
         return None
     try:
+        if sparse:
+            if Y.ndim != 1 or Y.min() < 0 or Y.max() >= classes:
+                return None
+            return Y.astype(np.intp)
         one_hot = np.zeros((classes, Y.shape[0]))
         one_hot[Y, np.arange(Y.shape[0])] = 1
         return one_hot
@@ -11,9 +11,15 @@ def one_hot_decode(one_hot):
     """Converts a one-hot matrix into a vector of labels
 
     Args:
-        one_hot (_type_): _description_
+        one_hot (_type_): _description_, or the sparse form of
+                          one_hot_encode, returned as is
     """
-    if not isinstance(one_hot, np.ndarray) or len(one_hot.shape) != 2:
+    if not isinstance(one_hot, np.ndarray):
+        return None
+    if one_hot.ndim == 1 and np.issubdtype(one_hot.dtype, np.integer):
+        # sparse one-hot: already the label of each example
+        return one_hot
+    if len(one_hot.shape) != 2:
         return None
     try:
         return np.argmax(one_hot, axis=0)
@@ -2,28 +2,139 @@
 """ Deep Neural Network
 """
 
+import json
+import os
 import numpy as np
-import matplotlib.pyplot as plt
 import pickle
 
+TrainingHistory = __import__('32-training_history').TrainingHistory
+batches = __import__('33-batching').batches
+evaluate_stream = __import__('33-batching').evaluate_stream
+one_hot_decode = __import__('25-one_hot_decode').one_hot_decode
+
+
+def _sigmoid(z, out):
+    """ sigmoid function: 1 / (1 + exp(-z)), out may be z """
+    np.negative(z, out=out)
+    np.exp(out, out=out)
+    out += 1
+    return np.reciprocal(out, out=out)
+
+
+def _sigmoid_backward(z, A, dz, tmp):
+    """ sigmoid derivative: A * (1 - A) """
+    np.subtract(1, A, out=tmp)
+    tmp *= A
+    dz *= tmp
+
+
+def _tanh(z, out):
+    """ tanh function, out may be z """
+    return np.tanh(z, out=out)
+
+
+def _tanh_backward(z, A, dz, tmp):
+    """ tanh derivative: 1 - A ** 2 """
+    np.square(A, out=tmp)
+    np.subtract(1, tmp, out=tmp)
+    dz *= tmp
+
+
+def _relu(z, out):
+    """ ReLU function: max(z, 0), out may be z """
+    return np.maximum(z, 0, out=out)
+
+
+def _relu_backward(z, A, dz, tmp):
+    """ ReLU derivative: 1 where A > 0, else 0 """
+    np.greater(A, 0, out=tmp)
+    dz *= tmp
+
+
+def _leaky_relu(z, out, slope=0.01):
+    """ Leaky ReLU function: z where z > 0, else slope * z, out may be z """
+    if out is not z:
+        np.copyto(out, z)
+    return np.multiply(out, slope, out=out, where=out < 0)
+
+
+def _leaky_relu_backward(z, A, dz, tmp, slope=0.01):
+    """ Leaky ReLU derivative: 1 where A > 0, else slope """
+    np.greater(A, 0, out=tmp)
+    tmp *= 1 - slope
+    tmp += slope
+    dz *= tmp
+
+
+def _gelu(z, out):
+    """ GELU function, sigmoid approximation z * sigmoid(1.702 * z),
+        out must not be z """
+    np.multiply(z, 1.702, out=out)
+    _sigmoid(out, out)
+    out *= z
+    return out
+
+
+def _gelu_backward(z, A, dz, tmp):
+    """ GELU derivative: s * (1 + 1.702 * z * (1 - s)),
+        with s = sigmoid(1.702 * z) """
+    np.multiply(z, 1.702, out=tmp)
+    _sigmoid(tmp, tmp)
+    dz *= tmp
+    np.subtract(1, tmp, out=tmp)
+    tmp *= z
+    tmp *= 1.702
+    tmp += 1
+    dz *= tmp
+
+
+# hidden layer activations: name -> (forward, backward, needs_z)
+#   forward(z, out) writes the activation of z into out and returns it
+#   backward(z, A, dz, tmp) multiplies dz, holding da on entry, in place by
+#   the derivative at z, using tmp as scratch space
+#   needs_z tells whether backward uses z, which then has to be kept
+#   (otherwise z is None and the activation is computed in place)
+ACTIVATIONS = {
+    'sig': (_sigmoid, _sigmoid_backward, False),
+    'tanh': (_tanh, _tanh_backward, False),
+    'relu': (_relu, _relu_backward, False),
+    'leaky_relu': (_leaky_relu, _leaky_relu_backward, False),
+    'gelu': (_gelu, _gelu_backward, True),
+}
+
 
 class DeepNeuralNetwork:
     """ Class that defines a deep neural network performing binary
         classification.
     """
 
-    def __init__(self, nx, layers, activation='sig'):
+    def __init__(self, nx, layers, activation='sig', preallocate=False,
+                 dtype=np.float64):
         """ Instantiation function
 
         Args:
             nx (int): number of input features
             layers (list): representing the number of nodes in each layer of
                            the network
-            activation (str, optional): Activation function for hidden layers.
-                                        Defaults to 'sig'.
+            activation (str, optional): Activation function for hidden layers,
+                                        a key of ACTIVATIONS. Defaults to
+                                        'sig'.
+            preallocate (bool, optional): keep per-layer activation and
+                                          gradient buffers sized to the batch
+                                          and update them in place, so that
+                                          steady-state training allocates no
+                                          new arrays. The arrays of the cache
+                                          are then overwritten by the next
+                                          forward pass. Defaults to False.
+            dtype (type, optional): numpy.float32 or numpy.float64, type of
+                                    the weights, caches and gradients.
+                                    Defaults to numpy.float64.
         """
-        if activation not in ['sig', 'tanh']:
-            raise ValueError("activation must be 'sig' or 'tanh'")
+        if activation not in ACTIVATIONS:
+            raise ValueError('activation must be one of ' + ', '.join(
+                repr(name) for name in ACTIVATIONS))
+        if dtype not in (np.float32, np.float64):
+            raise TypeError('dtype must be numpy.float32 or numpy.float64')
         if not isinstance(nx, int):
             raise TypeError('nx must be an integer')
         if nx < 1:
@@ -38,6 +149,7 @@ class DeepNeuralNetwork:
         self.__cache = {}
         self.__weights = {}
         self.__activation = activation
+        self.__dtype = np.dtype(dtype)
 
         for i in range(self.__L):
             if not isinstance(layers[i], int) or layers[i] < 1:
@@ -45,15 +157,48 @@ class DeepNeuralNetwork:
 
             if i == 0:
                 # He et al. initialization
-                self.__weights['W' + str(i + 1)] = np.random.randn(
-                    layers[i], nx) * np.sqrt(2 / nx)
+                self.__weights['W' + str(i + 1)] = (np.random.randn(
+                    layers[i], nx) * np.sqrt(2 / nx)).astype(self.__dtype)
             else:
                 # He et al. initialization
-                self.__weights['W' + str(i + 1)] = np.random.randn(
+                self.__weights['W' + str(i + 1)] = (np.random.randn(
                     layers[i], layers[i - 1]) * np.sqrt(2 / layers[i - 1])
+                ).astype(self.__dtype)
 
             # Zero initialization
-            self.__weights['b' + str(i + 1)] = np.zeros((layers[i], 1))
+            self.__weights['b' + str(i + 1)] = np.zeros((layers[i], 1),
+                                                        dtype=self.__dtype)
+
+        self.__setup(preallocate)
+
+    def __setup(self, preallocate):
+        """ Build the per-layer state derived from the weights dictionary
+
+        Args:
+            preallocate (bool): see __init__
+        """
+        # per-layer lists sharing their arrays with the weights dictionary
+        self.__Ws = [self.__weights['W' + str(i + 1)]
+                     for i in range(self.__L)]
+        self.__bs = [self.__weights['b' + str(i + 1)]
+                     for i in range(self.__L)]
+        self.__keys = ['A' + str(i) for i in range(self.__L + 1)]
+        self.__param_keys = [('W' + str(i + 1), 'b' + str(i + 1))
+                             for i in range(self.__L)]
+        self.__preallocate = preallocate
+        # flat buffers of the largest batch size seen, see __buffers_for
+        self.__buffers = None
+        self.__log_A = None
+        # resolve the activation once instead of on every layer
+        self.__forward, self.__backward, self.__needs_z = ACTIVATIONS[
+            self.__activation]
+        self.__Zs = [None] * self.__L
+        self.__history = None
+        # (pre, post) pairs called around each layer, see add_hook
+        self.__hooks = []
+        if preallocate:
+            self.__dWs = [np.empty_like(W) for W in self.__Ws]
+            self.__dbs = [np.empty_like(b) for b in self.__bs]
 
     # getter methods
 
@@ -62,6 +207,11 @@ class DeepNeuralNetwork:
         """ Return activation function """
         return self.__activation
 
+    @property
+    def dtype(self):
+        """ Return the floating point type of the parameters """
+        return self.__dtype
+
     @property
     def L(self):
         """ Return layers in the neural network"""
@@ -77,23 +227,174 @@ class DeepNeuralNetwork:
         """Return weights and bias dictionary"""
         return self.__weights
 
+    @property
+    def preallocate(self):
+        """ Return whether the network trains in preallocated buffers """
+        return self.__preallocate
+
+    @property
+    def history(self):
+        """ Return the TrainingHistory of the last call to train """
+        return self.__history
+
+    def add_hook(self, pre=None, post=None):
+        """ Register callables run before and after each layer
+
+        Each one is called as hook(phase, layer, W, m) where phase is
+        'forward', 'backward' or 'update', layer goes from 1 to L, W is
+        the weights of the layer and m the number of examples. Without
+        hooks the layers run exactly as before.
+
+        Args:
+            pre (callable, optional): called before the layer runs
+            post (callable, optional): called after the layer ran
+
+        Returns:
+            tuple: the handle to give to remove_hook
+        """
+        handle = (pre, post)
+        self.__hooks.append(handle)
+        return handle
+
+    def remove_hook(self, handle):
+        """ Unregister hooks added by add_hook
+
+        Args:
+            handle (tuple): value returned by add_hook
+        """
+        self.__hooks.remove(handle)
+
+    def __run_hooks(self, position, phase, i, m):
+        """ Call the pre (position 0) or post (position 1) hooks of layer i
+        """
+        for hook in self.__hooks:
+            if hook[position] is not None:
+                hook[position](phase, i + 1, self.__Ws[i], m)
+
+    def __buffers_for(self, m, gradients=False):
+        """ Return the preallocated buffers for a batch of m examples
+
+        The buffers are flat arrays sized for the largest batch seen so
+        far, grown only when a larger one arrives, and returned as
+        contiguous (nodes, m) views of their head, as predict does, so
+        a short last mini-batch allocates nothing. The gradient buffers
+        are only allocated once a backward pass needs them.
+
+        Args:
+            m (int): number of examples in the batch
+            gradients (bool, optional): also return the gradient buffers.
+                                        Defaults to False.
+
+        Returns:
+            dict: per-layer lists of activation ('A') and, when the
+                  activation needs it, pre-activation ('z') buffers of
+                  shape (nodes, m), plus one (1, m) row buffer and the
+                  log-softmax ('log_A') buffer for the output layer; with
+                  gradients, also per-layer gradient ('dz') and scratch
+                  ('tmp') buffers
+        """
+        store = self.__buffers
+        sizes = [W.shape[0] for W in self.__Ws]
+        if store is None or store['capacity'] < m:
+            store = {'capacity': m, 'flat': {}, 'views': None}
+            self.__buffers = store
+        flat = store['flat']
+        kinds = ['A', 'z'] if self.__needs_z else ['A']
+        if gradients:
+            kinds += ['dz', 'tmp']
+        for kind in kinds:
+            if kind not in flat:
+                flat[kind] = [np.empty(n * store['capacity'], self.__dtype)
+                              for n in sizes]
+        if 'row' not in flat:
+            flat['row'] = [np.empty(store['capacity'], self.__dtype)]
+            flat['log_A'] = [np.empty(sizes[-1] * store['capacity'],
+                                      self.__dtype)]
+
+        # the views of the last batch size are kept until it changes
+        views = store['views']
+        if views is None or views['row'].shape[1] != m or \
+                any(kind not in views for kind in kinds):
+            views = {kind: [buffer[:n * m].reshape(n, m)
+                            for buffer, n in zip(flat[kind], sizes)]
+                     for kind in kinds}
+            views['row'] = flat['row'][0][:m].reshape(1, m)
+            views['log_A'] = flat['log_A'][0][:sizes[-1] * m].reshape(
+                sizes[-1], m)
+            store['views'] = views
+        return views
+
     def forward_prop(self, X):
         """ Forward propagation """
-        self.cache["A0"] = X
-        for i in range(1, self.L+1):
-            W = self.weights['W'+str(i)]
-            b = self.weights['b'+str(i)]
-            A = self.cache['A'+str(i - 1)]
-            z = np.matmul(W, A) + b
-            if i != self.L:
-                if self.activation == 'sig':
-                    A = 1 / (1 + np.exp(-z))  # sigmoid function
-                elif self.activation == 'tanh':
-                    A = np.tanh(z)  # tanh function
+        X = X.astype(self.__dtype, copy=False)
+        if self.__preallocate:
+            return self.__forward_prop_inplace(X)
+        self.__cache[self.__keys[0]] = X
+        A = X
+        hooks, m = self.__hooks, X.shape[1]
+        for i in range(self.__L):
+            if hooks:
+                self.__run_hooks(0, 'forward', i, m)
+            z = np.matmul(self.__Ws[i], A) + self.__bs[i]
+            if i != self.__L - 1:
+                if self.__needs_z:
+                    self.__Zs[i] = z
+                    A = self.__forward(z, np.empty_like(z))
+                else:
+                    A = self.__forward(z, z)
             else:
-                A = np.exp(z) / np.sum(np.exp(z), axis=0)  # softmax function
-            self.cache["A"+str(i)] = A
-        return self.cache["A"+str(i)], self.cache
+                # softmax function, shifted by the max so exp cannot
+                # overflow, keeping its log for the cost
+                z -= np.max(z, axis=0, keepdims=True)
+                A = np.exp(z)
+                total = np.sum(A, axis=0, keepdims=True)
+                A /= total
+                self.__log_A = z - np.log(total)
+            self.__cache[self.__keys[i + 1]] = A
+            if hooks:
+                self.__run_hooks(1, 'forward', i, m)
+        return A, self.__cache
+
+    def __forward_prop_inplace(self, X):
+        """ Forward propagation into the preallocated buffers
+
+        Args:
+            X (numpy.array): Input array with
+            shape (nx, m) = (features, no of examples)
+        """
+        hooks, m = self.__hooks, X.shape[1]
+        buffers = self.__buffers_for(m)
+        self.__cache[self.__keys[0]] = X
+        A_prev = X
+        for i in range(self.__L):
+            if hooks:
+                self.__run_hooks(0, 'forward', i, m)
+            A = buffers['A'][i]
+            z = A
+            if self.__needs_z and i != self.__L - 1:
+                # also kept in __Zs for gradients()
+                z = self.__Zs[i] = buffers['z'][i]
+            np.matmul(self.__Ws[i], A_prev, out=z)
+            z += self.__bs[i]
+            if i != self.__L - 1:
+                self.__forward(z, A)
+            else:
+                # softmax function, shifted by the max so exp cannot
+                # overflow, keeping its log for the cost
+                row, log_A = buffers['row'], buffers['log_A']
+                np.max(A, axis=0, keepdims=True, out=row)
+                np.subtract(A, row, out=log_A)
+                np.exp(log_A, out=A)
+                np.sum(A, axis=0, keepdims=True, out=row)
+                A /= row
+                np.log(row, out=row)
+                log_A -= row
+                self.__log_A = log_A
+            self.__cache[self.__keys[i + 1]] = A
+            A_prev = A
+            if hooks:
+                self.__run_hooks(1, 'forward', i, m)
+        return A, self.__cache
 
     def cost(self, Y, A):
         """ Calculate the cost of the Neural Network \
@@ -101,14 +402,27 @@ class DeepNeuralNetwork:
 
         Args:
             Y (numpy.array): Actual one-hot encoded \
-                labels with shape (classes, m)
+                labels with shape (classes, m), or the class index \
+                of each example with shape (m,), see 24-one_hot_encode.py
             A (numpy.array): Predicted probabilities \
                 from the output layer of the neural network
 
         Returns:
             float: Categorical cross-entropy cost
         """
-        cost = -np.sum(Y * np.log(A)) / Y.shape[1]
+        if self.__log_A is not None and \
+                A is self.__cache.get(self.__keys[-1]):
+            # fused path: log-softmax kept by the last forward pass
+            log_A = self.__log_A
+        else:
+            log_A = np.log(np.maximum(A, np.finfo(A.dtype).tiny))
+        m = Y.shape[-1]
+        if Y.ndim == 1:
+            # sparse labels: only the log-probability of each true class
+            log_A = log_A[Y, np.arange(m)]
+            Y = 1
+        # accumulate in float64 whatever the dtype of the network
+        cost = -np.sum(Y * log_A, dtype=np.float64) / m
         return cost
 
     def evaluate(self, X, Y):
@@ -119,17 +433,153 @@ class DeepNeuralNetwork:
             Y (numpy.array): Actual one-hot encoded labels
 
         Returns:
-            prediction, cost: return predictions and costs
+            prediction, cost: return the predicted class index of each
+                              example, shape (m,), and the cost
         """
-        self.forward_prop(X)
-        # get output of the neural network from the cache
-        A = self.cache.get("A" + str(self.L))
+        A, _ = self.forward_prop(X)
         # get the class with the highest probability
-        prediction = np.eye(A.shape[0])[np.argmax(A, axis=0)].T
+        prediction = np.argmax(A, axis=0)
         cost = self.cost(Y, A)
         return prediction, cost
 
-    def gradient_descent(self, Y, cache, alpha=0.05):
+    def evaluate_stream(self, X, Y=None, batch_size=65536):
+        """ Evaluate the network on data that does not fit in memory,
+            one chunk at a time, see 33-batching.py
+
+        Args:
+            X (numpy.ndarray or iterable): input data of shape (nx, m),
+                                           typically a numpy.memmap, or
+                                           an iterable of (X_chunk,
+                                           Y_chunk) pairs when Y is None
+            Y (numpy.ndarray, optional): one-hot labels of shape (classes, m)
+                                         or class indices of shape (m,)
+            batch_size (int, optional): number of examples per chunk when
+                                        X and Y are arrays.
+                                        Defaults to 65536.
+
+        Returns:
+            tuple: the cost and the accuracy over all the examples
+        """
+        return evaluate_stream(self.evaluate, X, Y, batch_size,
+                               decode=one_hot_decode)
+
+    def predict(self, X, batch_size=None, probabilities=False):
+        """ Predict without labels and without filling the cache
+
+        The examples are streamed through the network batch_size at a
+        time, each layer writing into one of two ping-pong buffers, so
+        the peak memory does not depend on the depth of the network.
+
+        Args:
+            X (numpy.array): Input array with shape (nx, m)
+            batch_size (int, optional): number of examples per chunk.
+                                        Defaults to None (all at once).
+            probabilities (bool, optional): return the softmax output
+                                            instead of the class indices.
+                                            Defaults to False.
+
+        Returns:
+            numpy.array: predicted class index of each example, shape (m,),
+                         or the probabilities, shape (classes, m)
+        """
+        m = X.shape[1]
+        if batch_size is None:
+            batch_size = m
+        if not isinstance(batch_size, int):
+            raise TypeError('batch_size must be an integer')
+        if batch_size < 1:
+            raise ValueError('batch_size must be positive')
+        batch_size = max(min(batch_size, m), 1)
+        widest = max(W.shape[0] for W in self.__Ws)
+        flat = [np.empty(widest * batch_size, self.__dtype) for _ in range(2)]
+        row = np.empty(batch_size, self.__dtype)
+        classes = self.__Ws[-1].shape[0]
+        if probabilities:
+            result = np.empty((classes, m), self.__dtype)
+        else:
+            result = np.empty(m, dtype=np.intp)
+
+        for start in range(0, m, batch_size):
+            A = X[:, start:start + batch_size].astype(self.__dtype,
+                                                      copy=False)
+            n = A.shape[1]
+            current = None
+            for i in range(self.__L):
+                W = self.__Ws[i]
+                shape = (W.shape[0], n)
+                # z goes to the buffer not holding A, the activation then
+                # goes in place, or to the other buffer once A is consumed
+                target = 1 if current == 0 else 0
+                z = flat[target][:W.shape[0] * n].reshape(shape)
+                np.matmul(W, A, out=z)
+                z += self.__bs[i]
+                if i == self.__L - 1:
+                    A, current = z, target
+                elif self.__needs_z:
+                    current = 1 - target
+                    A = flat[current][:W.shape[0] * n].reshape(shape)
+                    self.__forward(z, A)
+                else:
+                    A, current = self.__forward(z, z), target
+            if not probabilities:
+                np.argmax(A, axis=0, out=result[start:start + n])
+                continue
+            # softmax function, shifted by the max so exp cannot overflow
+            top = row[:n].reshape(1, n)
+            np.max(A, axis=0, keepdims=True, out=top)
+            A -= top
+            np.exp(A, out=A)
+            np.sum(A, axis=0, keepdims=True, out=top)
+            np.divide(A, top, out=result[:, start:start + n])
+        return result
+
+    def gradients(self, Y, cache):
+        """ Calculate the gradients of the cost without updating the weights
+
+        Args:
+            Y (numpy.array): Actual one-hot encoded labels, or class indices
+                             of shape (m,), see cost
+            cache (dict): Dictionary containing all intermediary values of the
+                        network
+
+        Returns:
+            list: (dw, db) tuple of each layer, averaged over the m examples;
+                  index i holds the gradients of layer i + 1
+        """
+        m = Y.shape[-1]
+        keys = self.__keys
+        grads = [None] * self.__L
+        hooks = self.__hooks
+
+        for i in range(self.__L - 1, -1, -1):
+            if hooks:
+                self.__run_hooks(0, 'backward', i, m)
+
+            A_prev = cache[keys[i]]
+            A = cache[keys[i + 1]]
+            W = self.__Ws[i]
+
+            if i == self.__L - 1:
+                if Y.ndim == 1:
+                    # A - Y without building the one-hot Y
+                    dz = A.copy()
+                    dz[Y, np.arange(m)] -= 1
+                else:
+                    dz = A - Y
+            else:
+                dz = da
+                self.__backward(self.__Zs[i], A, dz, np.empty_like(A))
+
+            db = dz.mean(axis=1, keepdims=True)
+            dw = np.matmul(dz, A_prev.T) / m
+            if i > 0:
+                da = np.matmul(W.T, dz)
+            grads[i] = (dw, db)
+            if hooks:
+                self.__run_hooks(1, 'backward', i, m)
+        return grads
+
+    def gradient_descent(self, Y, cache, alpha=0.05, optimizer=None):
         """ Calculate one pass of gradient descent on the neural network
 
         Args:
@@ -137,31 +587,91 @@ class DeepNeuralNetwork:
             cache (dict): Dictionary containing all intermediary values of the
                         network
             alpha (float): learning rate
+            optimizer (object, optional): stateful optimizer whose
+                                          update(key, var, grad) updates each
+                                          weight in place, see
+                                          optimization/16-optimizers.py; alpha
+                                          is then ignored. Defaults to None
+                                          (plain gradient descent).
         """
-        m = Y.shape[1]
-
-        for i in range(self.L, 0, -1):
+        if self.__preallocate:
+            return self.__gradient_descent_inplace(Y, cache, alpha, optimizer)
+        grads = self.gradients(Y, cache)
+        hooks, m = self.__hooks, Y.shape[-1]
+        for i, (dw, db) in enumerate(grads):
+            if hooks:
+                self.__run_hooks(0, 'update', i, m)
+            if optimizer is None:
+                self.__Ws[i] -= (alpha * dw)
+                self.__bs[i] -= (alpha * db)
+            else:
+                W_key, b_key = self.__param_keys[i]
+                optimizer.update(W_key, self.__Ws[i], dw)
+                optimizer.update(b_key, self.__bs[i], db)
+            if hooks:
+                self.__run_hooks(1, 'update', i, m)
 
-            A_prev = cache["A" + str(i - 1)]
-            A = cache["A" + str(i)]
-            W = self.weights["W" + str(i)]
+    def __gradient_descent_inplace(self, Y, cache, alpha, optimizer=None):
+        """ One pass of gradient descent in the preallocated buffers
 
-            if i == self.L:
-                dz = A - Y
+        Args:
+            Y (numpy.array): Actual one-hot encoded labels
+            cache (dict): Dictionary containing all intermediary values of the
+                        network
+            alpha (float): learning rate
+            optimizer (object, optional): see gradient_descent
+        """
+        m = Y.shape[-1]
+        buffers = self.__buffers_for(m, gradients=True)
+        As, dzs, tmps = buffers['A'], buffers['dz'], buffers['tmp']
+        hooks = self.__hooks
+
+        for i in range(self.__L - 1, -1, -1):
+            if hooks:
+                self.__run_hooks(0, 'backward', i, m)
+
+            A_prev = As[i - 1] if i > 0 else cache[self.__keys[0]]
+            A = As[i]
+            dz = dzs[i]
+
+            if i == self.__L - 1:
+                if Y.ndim == 1:
+                    np.copyto(dz, A)
+                    dz[Y, np.arange(m)] -= 1
+                else:
+                    np.subtract(A, Y, out=dz)
             else:
-                if self.activation == 'sig':
-                    dz = da * (A * (1 - A))  # sigmoid derivative
-                elif self.activation == 'tanh':
-                    dz = da * (1 - A**2)  # tanh derivative
-
-            db = dz.mean(axis=1, keepdims=True)
-            dw = np.matmul(dz, A_prev.T) / m
-            da = np.matmul(W.T, dz)
-            self.weights['W' + str(i)] -= (alpha * dw)
-            self.weights['b' + str(i)] -= (alpha * db)
+                # dz already holds da from the layer above
+                z = buffers['z'][i] if self.__needs_z else None
+                self.__backward(z, A, dz, tmps[i])
+
+            dW, db = self.__dWs[i], self.__dbs[i]
+            np.matmul(dz, A_prev.T, out=dW)
+            np.sum(dz, axis=1, keepdims=True, out=db)
+            if i > 0:
+                np.matmul(self.__Ws[i].T, dz, out=dzs[i - 1])
+            if hooks:
+                self.__run_hooks(1, 'backward', i, m)
+                self.__run_hooks(0, 'update', i, m)
+            if optimizer is None:
+                dW *= alpha / m
+                db *= alpha / m
+                self.__Ws[i] -= dW
+                self.__bs[i] -= db
+            else:
+                dW /= m
+                db /= m
+                W_key, b_key = self.__param_keys[i]
+                optimizer.update(W_key, self.__Ws[i], dW)
+                optimizer.update(b_key, self.__bs[i], db)
+            if hooks:
+                self.__run_hooks(1, 'update', i, m)
 
     def train(self, X, Y, iterations=5000,
-              alpha=0.05, verbose=True, graph=True, step=100):
+              alpha=0.05, verbose=True, graph=True, step=100,
+              batch_size=None, shuffle=False, optimizer=None,
+              profiler=None, validation_data=None, patience=None,
+              threshold=0.0):
         """ Train the deep neural network
 
         Args:
@@ -170,8 +680,43 @@ class DeepNeuralNetwork:
             iterations (int, optional): _description_. Defaults to 5000.
             alpha (float, optional): _description_. Defaults to 0.05.
             verbose (bool, optional): _description_. Defaults to True.
-            graph (bool, optional): _description_. Defaults to True.
+            graph (bool or str, optional): show the training curve with
+                                           pyplot, or render it in the
+                                           background to this image path.
+                                           Defaults to True.
             step (int, optional): _description_. Defaults to 100.
+            batch_size (int, optional): number of examples per mini-batch,
+                                        each iteration is then one epoch over
+                                        all the mini-batches. Defaults to None
+                                        (full-batch gradient descent).
+            shuffle (bool, optional): shuffle the mini-batches every epoch.
+                                      Defaults to False.
+            optimizer (object, optional): stateful optimizer used for the
+                                          updates instead of plain gradient
+                                          descent with alpha, see
+                                          gradient_descent. Defaults to None.
+            profiler (LayerProfiler, optional): profiler hooked around
+                                                every layer while training,
+                                                see 30-layer_profiler.py;
+                                                its summary is printed when
+                                                verbose. Defaults to None.
+            validation_data (tuple, optional): (X_valid, Y_valid) whose cost
+                                               is computed after every
+                                               iteration and monitored
+                                               instead of the training cost.
+                                               Defaults to None.
+            patience (int, optional): stop once the monitored cost has not
+                                      decreased by more than threshold for
+                                      patience iterations in a row, as in
+                                      regularization/7-early_stopping.py.
+                                      Defaults to None (never stop early).
+            threshold (float, optional): see patience. Defaults to 0.0.
+
+            When validation_data or patience is given, the weights with the
+            lowest monitored cost are kept in a snapshot and restored at
+            the end of training. Without validation_data the monitored cost
+            is the training cost of X, computed after each iteration on the
+            weights it would snapshot.
 
         Raises:
             TypeError: _description_
@@ -191,47 +736,159 @@ class DeepNeuralNetwork:
             raise TypeError('alpha must be a float')
         if alpha < 0:
             raise ValueError('alpha must be positive')
-
-        costs = []
+        if batch_size is not None:
+            if not isinstance(batch_size, int):
+                raise TypeError('batch_size must be an integer')
+            if batch_size < 1:
+                raise ValueError('batch_size must be positive')
+        if patience is not None:
+            if not isinstance(patience, int):
+                raise TypeError('patience must be an integer')
+            if patience < 1:
+                raise ValueError('patience must be a positive integer')
+        if not isinstance(threshold, float):
+            raise TypeError('threshold must be a float')
+        if threshold < 0:
+            raise ValueError('threshold must be positive')
+
+        X = X.astype(self.__dtype, copy=False)
+        if Y.ndim != 1:
+            Y = Y.astype(self.__dtype, copy=False)
+        self.__history = TrainingHistory()
+        m = X.shape[1]
+        monitor = validation_data is not None or patience is not None
+        if monitor:
+            # snapshot of the best weights, copied into on every improvement
+            # and starting from the initial weights in case none happens
+            params = self.__Ws + self.__bs
+            best = [np.copy(param) for param in params]
+            opt_cost = np.inf
+            X_valid, Y_valid = (X, Y) if validation_data is None \
+                else validation_data
+            count = 0
+        if profiler is not None:
+            profiler.start()
+            handle = self.add_hook(profiler.pre, profiler.post)
         for i in range(iterations):
-            self.forward_prop(X)
-            self.gradient_descent(Y, self.cache, alpha)
-            if verbose and i % step == 0:
-
-                cost = self.cost(Y, self.cache["A"+str(self.L)])
-                costs.append(cost)
-                print('Cost after {} iterations: {}'.format(i, cost))
-        if graph:
-            plt.plot(np.arange(0, iterations, step), costs)
-            plt.xlabel('iteration')
-            plt.ylabel('cost')
-            plt.title('Training Cost')
-            plt.show()
+            report = i % step == 0
+            cost = 0
+            for batch in batches(m, batch_size, shuffle):
+                Y_batch = Y[..., batch]
+                A, cache = self.forward_prop(X[:, batch])
+                self.gradient_descent(Y_batch, cache, alpha, optimizer)
+                if report:
+                    cost += self.cost(Y_batch, A) * Y_batch.shape[-1] / m
+            if monitor:
+                valid_cost = self.cost(Y_valid, self.predict(
+                    X_valid, probabilities=True))
+            if report:
+                if validation_data is None:
+                    self.__history.append(i, cost)
+                else:
+                    self.__history.append(i, cost, valid_cost)
+            if report and verbose:
+                if validation_data is None:
+                    print('Cost after {} iterations: {}'.format(i, cost))
+                else:
+                    print('Cost after {} iterations: {}, validation cost: {}'
+                          .format(i, cost, valid_cost))
+            if monitor:
+                # same rule as early_stopping in regularization, a NaN
+                # cost counting as no improvement
+                if not opt_cost - valid_cost > threshold:
+                    count += 1
+                else:
+                    count = 0
+                if valid_cost < opt_cost:
+                    opt_cost = valid_cost
+                    for param, copy in zip(params, best):
+                        np.copyto(copy, param)
+                if patience is not None and count >= patience:
+                    if verbose:
+                        print('Early stopping after {} iterations'.format(
+                            i + 1))
+                    break
+        if monitor:
+            for param, copy in zip(params, best):
+                np.copyto(param, copy)
+        if profiler is not None:
+            self.remove_hook(handle)
+            profiler.stop()
+            if verbose:
+                print(profiler.summary())
+        if isinstance(graph, str):
+            self.__history.render(graph)
+        elif graph:
+            self.__history.show()
         return self.evaluate(X, Y)
 
     def save(self, filename):
-        """ Save the instance object to a file in pickle format
+        """ Save the weights to a checkpoint directory
+
+        The checkpoint holds one raw .npy file per weight and bias plus
+        a header.json describing the network. The cache is not saved.
 
         Args:
-            filename (_type_): _description_
+            filename (str): checkpoint directory, '.ckpt' is appended
+                            when missing
         """
-        if not filename.endswith(".pkl"):
-            filename += ".pkl"
-        with open(filename, 'wb') as f:
-            pickle.dump(self, f)
+        if not filename.endswith(".ckpt"):
+            filename += ".ckpt"
+        os.makedirs(filename, exist_ok=True)
+        for key, value in self.__weights.items():
+            np.save(os.path.join(filename, key + '.npy'), value)
+        header = {
+            'nx': int(self.__Ws[0].shape[1]),
+            'layers': [int(W.shape[0]) for W in self.__Ws],
+            'activation': self.__activation,
+            'dtype': self.__dtype.name,
+        }
+        # written last, so a directory without header is an incomplete save
+        with open(os.path.join(filename, 'header.json'), 'w') as f:
+            json.dump(header, f)
 
     @staticmethod
-    def load(filename):
-        """ Load a pickled DeepNeuralNetwork object
+    def load(filename, mmap_mode='r'):
+        """ Load a DeepNeuralNetwork from a checkpoint directory
+
+        With the default mmap_mode the weights are memory-mapped read-only,
+        so every process loading the same checkpoint shares one copy of
+        them through the page cache. Use mmap_mode=None (copy in memory)
+        or 'c' (copy-on-write) to keep training the loaded network.
+        Files written by the former pickle format are still loaded.
 
         Args:
-            filename (_type_): _description_
+            filename (str): checkpoint directory written by save
+            mmap_mode (str, optional): passed to numpy.load.
+                                       Defaults to 'r'.
 
         Returns:
-            _type_: _description_
+            DeepNeuralNetwork: the loaded network, or None if filename
+                               does not exist
         """
-        try:
+        if os.path.isfile(filename):
             with open(filename, 'rb') as f:
-                return pickle.load(f)
+                network = pickle.load(f)
+            # the former class only pickled __L, __cache, __weights and
+            # __activation, rebuild the state derived from them
+            network.__dtype = network.__weights['W1'].dtype
+            network.__setup(False)
+            return network
+        try:
+            with open(os.path.join(filename, 'header.json')) as f:
+                header = json.load(f)
         except FileNotFoundError:
             return None
+
+        network = DeepNeuralNetwork.__new__(DeepNeuralNetwork)
+        network.__L = len(header['layers'])
+        network.__cache = {}
+        network.__activation = header['activation']
+        network.__dtype = np.dtype(header['dtype'])
+        network.__weights = {}
+        for i in range(network.__L):
+            for key in ('W' + str(i + 1), 'b' + str(i + 1)):
+                network.__weights[key] = np.load(
+                    os.path.join(filename, key + '.npy'), mmap_mode=mmap_mode)
+        network.__setup(False)
+        return network
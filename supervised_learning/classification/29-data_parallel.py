@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+""" Data-parallel training of a DeepNeuralNetwork
+"""
+
+import multiprocessing as mp
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+batches = __import__('33-batching').batches
+
+# state of a worker process, set once by _init_worker
+_worker = {}
+
+
+def _views(buffer, shapes, dtype):
+    """ Split a flat shared buffer into arrays of the given shapes
+
+    Args:
+        buffer (memoryview): buffer of a SharedMemory block
+        shapes (list): shape of each array, in order
+        dtype (numpy.dtype): type of the arrays
+
+    Returns:
+        list: numpy arrays backed by the buffer
+    """
+    arrays = []
+    offset = 0
+    for shape in shapes:
+        arrays.append(np.ndarray(shape, dtype, buffer, offset))
+        offset += int(np.prod(shape)) * dtype.itemsize
+    return arrays
+
+
+def _parameters(network):
+    """ List the parameters of a network in a fixed order
+
+    Args:
+        network (DeepNeuralNetwork): the network
+
+    Returns:
+        list: W1, b1, W2, b2, ... arrays of the network
+    """
+    return [network.weights[key + str(i + 1)]
+            for i in range(network.L) for key in ('W', 'b')]
+
+
+def _init_worker(network, X, Y, names, shapes, dtype, slots):
+    """ Attach a worker process to the shared weights and gradients
+
+    Args:
+        network (DeepNeuralNetwork): private copy of the network
+        X (numpy.array): training inputs
+        Y (numpy.array): training labels
+        names (tuple): names of the weights and gradients SharedMemory
+        shapes (list): shapes of the parameters, see _parameters
+        dtype (numpy.dtype): type of the parameters
+        slots (int): number of gradient slots
+    """
+    weights_shm = shared_memory.SharedMemory(name=names[0])
+    grads_shm = shared_memory.SharedMemory(name=names[1])
+    size = sum(int(np.prod(shape)) for shape in shapes) * dtype.itemsize
+    _worker['shms'] = (weights_shm, grads_shm)
+    _worker['network'] = network
+    _worker['params'] = _parameters(network)
+    _worker['X'] = X
+    _worker['Y'] = Y
+    _worker['weights'] = _views(weights_shm.buf, shapes, dtype)
+    _worker['grads'] = [_views(grads_shm.buf[slot * size:], shapes, dtype)
+                        for slot in range(slots)]
+
+
+def _worker_step(job):
+    """ Compute the gradients of one shard of a mini-batch
+
+    The gradients, summed over the examples of the shard, are written
+    to the gradient slot of the job in shared memory.
+
+    Args:
+        job (tuple): gradient slot and column indices of the shard
+
+    Returns:
+        float: cost of the shard, summed over its examples
+    """
+    slot, shard = job
+    network = _worker['network']
+    for param, shared in zip(_worker['params'], _worker['weights']):
+        np.copyto(param, shared)
+    Y = _worker['Y'][..., shard]
+    A, cache = network.forward_prop(_worker['X'][:, shard])
+    m = Y.shape[-1]
+    grads = [grad for pair in network.gradients(Y, cache) for grad in pair]
+    for grad, out in zip(grads, _worker['grads'][slot]):
+        np.multiply(grad, m, out=out)
+    return network.cost(Y, A) * m
+
+
+def _shards(batch, workers):
+    """ Split the column indices of a mini-batch between the workers
+
+    Args:
+        batch (slice or numpy.array): columns of the mini-batch
+        workers (int): number of workers
+
+    Returns:
+        list: non-empty slices or index arrays, one per worker at most
+    """
+    if isinstance(batch, slice):
+        edges = np.linspace(batch.start, batch.stop, workers + 1).astype(int)
+        return [slice(a, b) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+    return [shard for shard in np.array_split(batch, workers) if shard.size]
+
+
+def train_data_parallel(network, X, Y, iterations=5000, alpha=0.05,
+                        batch_size=None, shuffle=False, workers=None,
+                        verbose=True, step=100):
+    """ Train a DeepNeuralNetwork with data parallelism
+
+    Each mini-batch is sharded across a process pool. Every worker copies
+    the weights from shared memory into its own copy of the network and
+    computes the gradients of its shard with DeepNeuralNetwork.gradients
+    into its own slot of a shared gradient block. The parent then sums
+    the slots (all-reduce) and applies the update to the shared weights,
+    which the workers read on the next step. X and Y are handed to the
+    workers once, when the pool starts.
+
+    Args:
+        network (DeepNeuralNetwork): network to train, updated in place
+        X (numpy.array): input data with shape (nx, m)
+        Y (numpy.array): one-hot encoded labels with shape (classes, m),
+                         or class indices with shape (m,)
+        iterations (int, optional): number of epochs. Defaults to 5000.
+        alpha (float, optional): learning rate. Defaults to 0.05.
+        batch_size (int, optional): number of examples per mini-batch.
+                                    Defaults to None (full batch).
+        shuffle (bool, optional): shuffle the mini-batches every epoch.
+                                  Defaults to False.
+        workers (int, optional): number of processes.
+                                 Defaults to None (os.cpu_count()).
+        verbose (bool, optional): print the cost every step epochs.
+                                  Defaults to True.
+        step (int, optional): Defaults to 100.
+
+    Returns:
+        tuple: the result of network.evaluate(X, Y) after training
+    """
+    if not isinstance(iterations, int):
+        raise TypeError('iterations must be an integer')
+    if iterations < 1:
+        raise ValueError('iterations must be a positive integer')
+    if not isinstance(alpha, float):
+        raise TypeError('alpha must be a float')
+    if alpha < 0:
+        raise ValueError('alpha must be positive')
+    if batch_size is not None:
+        if not isinstance(batch_size, int):
+            raise TypeError('batch_size must be an integer')
+        if batch_size < 1:
+            raise ValueError('batch_size must be positive')
+    if workers is None:
+        workers = os.cpu_count()
+    if not isinstance(workers, int):
+        raise TypeError('workers must be an integer')
+    if workers < 1:
+        raise ValueError('workers must be positive')
+
+    dtype = network.dtype
+    X = X.astype(dtype, copy=False)
+    if Y.ndim != 1:
+        Y = Y.astype(dtype, copy=False)
+    m = X.shape[1]
+    if batch_size is None:
+        batch_size = m
+    params = _parameters(network)
+    shapes = [param.shape for param in params]
+    size = sum(param.size for param in params)
+    weights_shm = shared_memory.SharedMemory(
+        create=True, size=size * dtype.itemsize)
+    grads_shm = shared_memory.SharedMemory(
+        create=True, size=workers * size * dtype.itemsize)
+    try:
+        shared = _views(weights_shm.buf, shapes, dtype)
+        for param, view in zip(params, shared):
+            np.copyto(view, param)
+        flat_weights = np.ndarray(size, dtype, weights_shm.buf)
+        grads = np.ndarray((workers, size), dtype, grads_shm.buf)
+        total = np.empty(size, dtype)
+        names = (weights_shm.name, grads_shm.name)
+
+        with mp.Pool(workers, _init_worker,
+                     (network, X, Y, names, shapes, dtype, workers)) as pool:
+            for i in range(iterations):
+                cost = 0
+                for batch in batches(m, batch_size, shuffle):
+                    shards = _shards(batch, workers)
+                    costs = pool.map(_worker_step, enumerate(shards))
+                    # all-reduce of the gradients, then the SGD update
+                    np.sum(grads[:len(shards)], axis=0, out=total)
+                    n = batch.stop - batch.start \
+                        if isinstance(batch, slice) else batch.size
+                    total *= alpha / n
+                    flat_weights -= total
+                    cost += sum(costs)
+                if verbose and i % step == 0:
+                    print('Cost after {} iterations: {}'.format(i, cost / m))
+
+        for param, view in zip(params, shared):
+            np.copyto(param, view)
+    finally:
+        # the views must be released before the blocks can be closed
+        shared = flat_weights = grads = None
+        weights_shm.close()
+        weights_shm.unlink()
+        grads_shm.close()
+        grads_shm.unlink()
+    return network.evaluate(X, Y)
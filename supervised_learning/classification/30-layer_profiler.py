@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+""" Per-layer profiler for the DeepNeuralNetwork hooks
+"""
+
+import time
+import tracemalloc
+
+# cost of the activation functions, in floating point operations per
+# element, used to estimate the FLOPs of each layer
+ACTIVATION_FLOPS = {'sig': 4, 'tanh': 6, 'relu': 1, 'leaky_relu': 2,
+                    'gelu': 6}
+
+
+class LayerProfiler():
+    """ Record wall time, FLOPs and memory of each layer of a network
+
+    The pre and post methods are the hooks of
+    DeepNeuralNetwork.add_hook, each call being keyed by its phase
+    ('forward', 'backward' or 'update') and its layer (1 to L).
+    """
+
+    def __init__(self, activation='sig', memory=True):
+        """ Initialize the profiler
+
+        Args:
+            activation (str, optional): activation of the hidden layers,
+                                        used for the FLOP estimates.
+                                        Defaults to 'sig'.
+            memory (bool, optional): trace the bytes allocated in each
+                                     layer with tracemalloc, which slows
+                                     every allocation down while it runs.
+                                     Defaults to True.
+        """
+        self.__activation_flops = ACTIVATION_FLOPS.get(activation, 4)
+        self.__memory = memory
+        self.__started = False
+        self.__records = {}
+        self.__start = {}
+
+    @property
+    def records(self):
+        """ Return the totals of each (phase, layer): a dict holding
+            'calls', 'time' (seconds), 'flops' and 'bytes' """
+        return self.__records
+
+    def start(self):
+        """ Start tracing the allocations, when memory is traced """
+        if self.__memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started = True
+
+    def stop(self):
+        """ Stop tracing the allocations, if start began it """
+        if self.__started:
+            tracemalloc.stop()
+            self.__started = False
+
+    def reset(self):
+        """ Forget everything recorded so far """
+        self.__records = {}
+        self.__start = {}
+
+    def flops(self, phase, W, m):
+        """ Estimate the floating point operations of a layer
+
+        Args:
+            phase (str): 'forward', 'backward' or 'update'
+            W (numpy.array): weights of the layer, shape (n, n_prev)
+            m (int): number of examples
+
+        Returns:
+            int: 2 n n_prev m for the forward matmul plus the activation,
+                 twice the matmuls for the backward pass (dW and dA) and
+                 two operations per parameter for the update
+        """
+        n, n_prev = W.shape
+        if phase == 'forward':
+            return 2 * n * n_prev * m + (self.__activation_flops + 1) * n * m
+        if phase == 'backward':
+            return 4 * n * n_prev * m + (self.__activation_flops + 2) * n * m
+        return 2 * (n * n_prev + n)
+
+    def pre(self, phase, layer, W, m):
+        """ Hook called before a layer runs """
+        if self.__memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            size = tracemalloc.get_traced_memory()[0]
+        else:
+            size = 0
+        self.__start[(phase, layer)] = (size, time.perf_counter())
+
+    def post(self, phase, layer, W, m):
+        """ Hook called after a layer ran """
+        end = time.perf_counter()
+        size, start = self.__start.pop((phase, layer))
+        if self.__memory and tracemalloc.is_tracing():
+            allocated = tracemalloc.get_traced_memory()[1] - size
+        else:
+            allocated = 0
+        record = self.__records.get((phase, layer))
+        if record is None:
+            record = {'calls': 0, 'time': 0.0, 'flops': 0, 'bytes': 0}
+            self.__records[(phase, layer)] = record
+        record['calls'] += 1
+        record['time'] += end - start
+        record['flops'] += self.flops(phase, W, m)
+        record['bytes'] += allocated
+
+    def summary(self):
+        """ Format the records as a table
+
+        Returns:
+            str: one row per phase and layer with the number of calls,
+                 the total and mean time, the GFLOP/s reached and the
+                 MB allocated, followed by the total of each phase
+        """
+        header = '{:<9} {:>5} {:>7} {:>10} {:>10} {:>9} {:>10}'
+        row = '{:<9} {:>5} {:>7} {:>10.2f} {:>10.4f} {:>9.2f} {:>10.2f}'
+        lines = [header.format('phase', 'layer', 'calls', 'total ms',
+                               'mean ms', 'GFLOP/s', 'alloc MB')]
+        totals = {}
+        for phase in ('forward', 'backward', 'update'):
+            keys = sorted(key for key in self.__records if key[0] == phase)
+            for key in keys:
+                record = self.__records[key]
+                lines.append(row.format(phase, key[1], *self.__columns(
+                    record)))
+                total = totals.setdefault(phase, {'calls': 0, 'time': 0.0,
+                                                  'flops': 0, 'bytes': 0})
+                for name in total:
+                    total[name] += record[name]
+        for phase, total in totals.items():
+            lines.append(row.format(phase, 'all', *self.__columns(total)))
+        return '\n'.join(lines)
+
+    @staticmethod
+    def __columns(record):
+        """ Return the calls, total ms, mean ms, GFLOP/s and MB of a record
+        """
+        seconds = record['time']
+        return (record['calls'], seconds * 1e3,
+                seconds * 1e3 / max(record['calls'], 1),
+                record['flops'] / seconds / 1e9 if seconds else 0.0,
+                record['bytes'] / 2 ** 20)
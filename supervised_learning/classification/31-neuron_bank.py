@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Class NeuronBank that trains many independent neurons at once
+"""
+
+
+import numpy as np
+
+
+class NeuronBank:
+    """ Class NeuronBank
+
+    k independent Neurons (see 7-neuron.py) sharing the same input X,
+    each with its own row of labels. The weights are stacked into one
+    (k, nx) matrix so every iteration is a single matmul for all models.
+    """
+
+    def __init__(self, nx, k, dtype=np.float64):
+        """ Instantiation function of the bank
+
+        The weights are drawn like k Neurons created one after the other,
+        so with the same seed row i matches the i-th Neuron.
+
+        Args:
+            nx (int): number of features to be initialized
+            k (int): number of neurons in the bank
+            dtype (type, optional): numpy.float32 or numpy.float64, type of
+                                    the weights, activations and gradients.
+                                    Defaults to numpy.float64.
+
+        Raises:
+            TypeError: nx or k is not an integer, or dtype is not supported
+            ValueError: nx or k is less than 1
+        """
+        if not isinstance(nx, int):
+            raise TypeError('nx must be an integer')
+        if nx < 1:
+            raise ValueError('nx must be positive')
+        if not isinstance(k, int):
+            raise TypeError('k must be an integer')
+        if k < 1:
+            raise ValueError('k must be positive')
+        if dtype not in (np.float32, np.float64):
+            raise TypeError('dtype must be numpy.float32 or numpy.float64')
+
+        # initialize private instance attributes
+        self.__dtype = np.dtype(dtype)
+        self.__W = np.random.normal(size=(k, nx)).astype(self.__dtype)
+        self.__b = np.zeros((k, 1), dtype=self.__dtype)
+        self.__A = 0
+
+        # getter function
+    @property
+    def dtype(self):
+        """Return the floating point type of the parameters"""
+        return self.__dtype
+
+    @property
+    def k(self):
+        """Return the number of neurons"""
+        return self.__W.shape[0]
+
+    @property
+    def W(self):
+        """Return weights, one row per neuron"""
+        return self.__W
+
+    @property
+    def b(self):
+        """Return biases, shape (k, 1)"""
+        return self.__b
+
+    @property
+    def A(self):
+        """Return output, one row per neuron"""
+        return self.__A
+
+    def forward_prop(self, X):
+        """Calculates the forward propagation of every neuron
+
+        Args:
+            X (numpy.ndarray): matrix with the input data of shape (nx, m)
+
+        Returns:
+            numpy.ndarray: The output of the neurons, shape (k, m)
+        """
+        X = X.astype(self.__dtype, copy=False)
+        z = np.matmul(self.__W, X)
+        z += self.__b
+        # sigmoid function: 1 / (1 + exp(-z)), computed in place
+        np.negative(z, out=z)
+        np.exp(z, out=z)
+        z += 1
+        np.reciprocal(z, out=z)
+        self.__A = z
+        return self.__A
+
+    def cost(self, Y, A):
+        """ Compute the cost of each model using logistic regression
+
+        Args:
+            Y (np.array): True values, shape (k, m)
+            A (np.array): Prediction values, shape (k, m)
+
+        Returns:
+            numpy.ndarray: cost of each neuron, shape (k,)
+        """
+        # calculate in float64, as Neuron.cost does
+        A = np.asarray(A, dtype=np.float64)
+        loss = - (Y * np.log(A) + (1 - Y) * np.log(1.0000001 - A))
+        return np.mean(loss, axis=1)
+
+    def evaluate(self, X, Y):
+        """ Evaluate every neuron
+
+        Args:
+            X (numpy.ndarray): input data of shape (nx, m)
+            Y (numpy.ndarray): labels of shape (k, m), row i for neuron i
+
+        Returns:
+            tuple: predicted labels (1 or 0) of shape (k, m) and the cost
+                   of each neuron, shape (k,); row i is what
+                   Neuron.evaluate returns for neuron i
+        """
+        pred = self.forward_prop(X)
+        cost = self.cost(Y, pred)
+        pred = np.where(pred > 0.5, 1, 0)
+        return (pred, cost)
+
+    def gradient_descent(self, X, Y, A, alpha=0.05):
+        """ Calculate one pass of gradient descent on every neuron
+
+        Args:
+            X (numpy.ndarray): input data of shape (nx, m)
+            Y (numpy.ndarray): labels of shape (k, m)
+            A (numpy.ndarray): activated output of shape (k, m)
+            alpha (float, optional): learning rate. Defaults to 0.05.
+        """
+        dz = A - Y
+        m = X.shape[1]
+        dw = np.matmul(dz, X.T)
+        dw *= alpha / m
+        self.__W -= dw
+        self.__b -= alpha * np.mean(dz, axis=1, keepdims=True)
+
+    def train(self, X, Y, iterations=5000, alpha=0.05,
+              verbose=True, step=100):
+        """Train every neuron on its own row of labels
+
+        Args:
+            X (numpy.ndarray): input data of shape (nx, m)
+            Y (numpy.ndarray): labels of shape (k, m)
+            iterations (int, optional): number of iterations.
+                                        Defaults to 5000.
+            alpha (float, optional): learning rate. Defaults to 0.05.
+            verbose (bool, optional): print the mean cost of the neurons
+                                      every step iterations.
+                                      Defaults to True.
+            step (int, optional): see verbose. Defaults to 100.
+
+        Raises:
+            TypeError: iterations is not an integer or alpha not a float
+            ValueError: iterations or alpha is negative, or Y does not
+                        have one row per neuron
+
+        Returns:
+            tuple: see evaluate
+        """
+        if not isinstance(iterations, int):
+            raise TypeError('iterations must be an integer')
+        if iterations < 0:
+            raise ValueError('iterations must be positive')
+        if not isinstance(alpha, float):
+            raise TypeError('alpha must be a float')
+        if alpha < 0:
+            raise ValueError('alpha must be positive')
+        if Y.shape != (self.k, X.shape[1]):
+            raise ValueError('Y must have shape (k, m)')
+
+        X = X.astype(self.__dtype, copy=False)
+        Y = Y.astype(self.__dtype, copy=False)
+        for i in range(iterations):
+            A = self.forward_prop(X)
+            if verbose and i % step == 0:
+                cost = self.cost(Y, A)
+                print('Cost after {} iterations: {}'.format(
+                    i, np.mean(cost)))
+            self.gradient_descent(X, Y, A, alpha)
+        return self.evaluate(X, Y)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+""" Training history of the classification models
+"""
+
+import threading
+
+import numpy as np
+
+
+class TrainingHistory:
+    """ Costs recorded every step iterations by train
+
+    matplotlib is only imported when the curve is drawn, and render
+    draws it to a file in a background thread without pyplot, so
+    neither headless jobs nor worker processes pay for it otherwise.
+    """
+
+    def __init__(self):
+        """ Create an empty history """
+        self.__steps = []
+        self.__costs = []
+        self.__validation_costs = []
+
+    def __len__(self):
+        """ Return the number of recorded steps """
+        return len(self.__steps)
+
+    @property
+    def steps(self):
+        """ Return the recorded iterations as an array """
+        return np.array(self.__steps, dtype=int)
+
+    @property
+    def costs(self):
+        """ Return the training cost of each recorded iteration """
+        return np.array(self.__costs, dtype=np.float64)
+
+    @property
+    def validation_costs(self):
+        """ Return the validation cost of each recorded iteration, or None
+            when there was no validation data """
+        if not self.__validation_costs:
+            return None
+        return np.array(self.__validation_costs, dtype=np.float64)
+
+    def append(self, step, cost, validation_cost=None):
+        """ Record the cost after an iteration
+
+        Args:
+            step (int): the iteration
+            cost (float): training cost
+            validation_cost (float, optional): validation cost.
+                                               Defaults to None.
+        """
+        self.__steps.append(step)
+        self.__costs.append(float(cost))
+        if validation_cost is not None:
+            self.__validation_costs.append(float(validation_cost))
+
+    def to_csv(self, filename):
+        """ Write the history to a CSV file
+
+        Args:
+            filename (str): path of the file, with an iteration,cost
+                            header and a validation_cost column when
+                            there was validation data
+        """
+        columns = [self.steps, self.costs]
+        header = 'iteration,cost'
+        if self.validation_costs is not None:
+            columns.append(self.validation_costs)
+            header += ',validation_cost'
+        np.savetxt(filename, np.column_stack(columns), delimiter=',',
+                   header=header, comments='', fmt=['%d'] + ['%.17g'] * (
+                       len(columns) - 1))
+
+    def __draw(self, axes):
+        """ Draw the curves on a matplotlib Axes """
+        axes.plot(self.steps, self.costs, label='cost')
+        if self.validation_costs is not None:
+            axes.plot(self.steps, self.validation_costs,
+                      label='validation cost')
+            axes.legend()
+        axes.set_xlabel('iteration')
+        axes.set_ylabel('cost')
+        axes.set_title('Training Cost')
+
+    def show(self):
+        """ Plot the curve in a pyplot window, as train(graph=True) did """
+        import matplotlib.pyplot as plt
+
+        self.__draw(plt.gca())
+        plt.show()
+
+    def render(self, filename, block=False):
+        """ Save the curve to an image file, by default in the background
+
+        The figure is built with the object oriented API on an Agg
+        canvas, which does not touch the pyplot state and is safe to
+        use from another thread.
+
+        Args:
+            filename (str): path of the image, its extension giving the
+                            format
+            block (bool, optional): wait until the file is written.
+                                    Defaults to False.
+
+        Returns:
+            threading.Thread: the thread writing the file, to join
+        """
+        thread = threading.Thread(target=self.__save, args=(filename,))
+        thread.start()
+        if block:
+            thread.join()
+        return thread
+
+    def __save(self, filename):
+        """ Draw the curve on an Agg canvas and save it """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        self.__draw(figure.add_subplot())
+        figure.savefig(filename)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+""" Chunking helpers shared by the classification models
+"""
+
+import numpy as np
+
+
+def batches(m, batch_size=None, shuffle=False):
+    """ Yield the column indices of each mini-batch of an epoch
+
+    Args:
+        m (int): number of examples
+        batch_size (int, optional): number of examples per mini-batch,
+                                    None for a single full batch
+        shuffle (bool, optional): visit the examples in a new random
+                                  order each epoch. Defaults to False.
+
+    Returns:
+        generator: slices (views of X) when not shuffling, otherwise
+                   arrays of indices into X
+    """
+    if batch_size is None:
+        batch_size = m
+    if not shuffle:
+        for start in range(0, m, batch_size):
+            yield slice(start, min(start + batch_size, m))
+        return
+    order = np.random.permutation(m)
+    for start in range(0, m, batch_size):
+        yield order[start:start + batch_size]
+
+
+def evaluate_stream(evaluate, X, Y=None, batch_size=65536, decode=None):
+    """ Evaluate a model on data that does not fit in memory
+
+    The examples are passed through evaluate one chunk at a time and the
+    cost and accuracy accumulated, weighted by the chunk sizes, so they
+    match evaluate on the whole data up to the rounding of the sum.
+
+    Args:
+        evaluate (callable): evaluate method of the model, returning the
+                             predictions and the mean cost of a chunk
+        X (numpy.ndarray or iterable): input data of shape (nx, m),
+                                       typically a numpy.memmap, or an
+                                       iterable of (X_chunk, Y_chunk)
+                                       pairs when Y is None
+        Y (numpy.ndarray, optional): labels, examples along the last axis
+        batch_size (int, optional): number of examples per chunk when X
+                                    and Y are arrays. Defaults to 65536.
+        decode (callable, optional): turns Y_chunk into what the
+                                     predictions are compared with.
+                                     Defaults to None (Y_chunk itself).
+
+    Raises:
+        TypeError: batch_size is not an integer
+        ValueError: batch_size is not positive, or there is no example
+
+    Returns:
+        tuple: the cost and the accuracy over all the examples
+    """
+    if Y is None:
+        chunks = X
+    else:
+        if not isinstance(batch_size, int):
+            raise TypeError('batch_size must be an integer')
+        if batch_size < 1:
+            raise ValueError('batch_size must be positive')
+        chunks = ((X[:, start:start + batch_size],
+                   Y[..., start:start + batch_size])
+                  for start in range(0, X.shape[1], batch_size))
+    total = 0.0
+    correct = 0
+    m = 0
+    for X_chunk, Y_chunk in chunks:
+        pred, cost = evaluate(X_chunk, Y_chunk)
+        n = Y_chunk.shape[-1]
+        labels = Y_chunk if decode is None else decode(Y_chunk)
+        correct += np.count_nonzero(pred == labels)
+        total += cost * n
+        m += n
+    if m == 0:
+        raise ValueError('no examples to evaluate')
+    return total / m, correct / m
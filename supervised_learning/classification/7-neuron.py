@@ -4,18 +4,24 @@
 
 
 import numpy as np
-import matplotlib.pyplot as plt
+
+TrainingHistory = __import__('32-training_history').TrainingHistory
+batches = __import__('33-batching').batches
+evaluate_stream = __import__('33-batching').evaluate_stream
 
 
 class Neuron:
     """ Class Neuron
     """
 
-    def __init__(self, nx):
+    def __init__(self, nx, dtype=np.float64):
         """ Instantiation function of the neuron
 
         Args:
             nx (int): number of features to be initialized
+            dtype (type, optional): numpy.float32 or numpy.float64, type of
+                                    the weights, activations and gradients.
+                                    Defaults to numpy.float64.
 
         Raises:
             TypeError: _description_
@@ -25,14 +31,23 @@ class Neuron:
             raise TypeError('nx must be an integer')
         if nx < 1:
             raise ValueError('nx must be positive')
+        if dtype not in (np.float32, np.float64):
+            raise TypeError('dtype must be numpy.float32 or numpy.float64')
 
         # initialize private instance attributes
-        self.__W = np.random.normal(size=(1, nx))
+        self.__dtype = np.dtype(dtype)
+        self.__W = np.random.normal(size=(1, nx)).astype(self.__dtype)
         self.__b = 0
         self.__A = 0
+        self.__history = None
 
         # getter function
     @property
+    def dtype(self):
+        """Return the floating point type of the parameters"""
+        return self.__dtype
+
+    @property
     def W(self):
         """Return weights"""
         return self.__W
@@ -47,6 +62,11 @@ class Neuron:
         """Return output"""
         return self.__A
 
+    @property
+    def history(self):
+        """Return the TrainingHistory of the last call to train"""
+        return self.__history
+
     def forward_prop(self, X):
         """Calculates the forward propagation of the neuron
 
@@ -56,6 +76,7 @@ class Neuron:
         Returns:
             numpy.ndarray: The output of the neural network.
         """
+        X = X.astype(self.__dtype, copy=False)
         z = np.matmul(self.__W, X) + self.__b
         sigmoid = 1 / (1 + np.exp(-z))
         self.__A = sigmoid
@@ -71,7 +92,9 @@ class Neuron:
         Returns:
             float: cost function
         """
-        # calculate
+        # calculate, always in float64 so float32 activations
+        # neither lose the 1.0000001 margin nor round the sum
+        A = np.asarray(A, dtype=np.float64)
         loss = - (Y * np.log(A) + (1 - Y) * np.log(1.0000001 - A))
         cost = np.mean(loss)
         return cost
@@ -91,6 +114,73 @@ class Neuron:
         pred = np.where(pred > 0.5, 1, 0)
         return (pred, cost)
 
+    def evaluate_stream(self, X, Y=None, batch_size=65536):
+        """ Evaluate the neuron on data that does not fit in memory,
+            one chunk at a time, see 33-batching.py
+
+        Args:
+            X (numpy.ndarray or iterable): input data of shape (nx, m),
+                                           typically a numpy.memmap, or
+                                           an iterable of (X_chunk,
+                                           Y_chunk) pairs when Y is None
+            Y (numpy.ndarray, optional): labels of shape (1, m)
+            batch_size (int, optional): number of examples per chunk when
+                                        X and Y are arrays.
+                                        Defaults to 65536.
+
+        Returns:
+            tuple: the cost and the accuracy over all the examples
+        """
+        return evaluate_stream(self.evaluate, X, Y, batch_size)
+
+    def predict(self, X, batch_size=None, probabilities=False):
+        """ Predict without labels, streaming X in chunks
+
+        Args:
+            X (numpy.ndarray): matrix with the input data of shape (nx, m)
+            batch_size (int, optional): number of examples per chunk.
+                                        Defaults to None (all at once).
+            probabilities (bool, optional): return the sigmoid output
+                                            instead of the labels.
+                                            Defaults to False.
+
+        Returns:
+            numpy.ndarray: predicted labels (1 or 0), or probabilities,
+                           of shape (1, m)
+        """
+        m = X.shape[1]
+        if batch_size is None:
+            batch_size = m
+        if not isinstance(batch_size, int):
+            raise TypeError('batch_size must be an integer')
+        if batch_size < 1:
+            raise ValueError('batch_size must be positive')
+        batch_size = max(min(batch_size, m), 1)
+        if probabilities:
+            result = np.empty((1, m), self.__dtype)
+        else:
+            result = np.empty((1, m), dtype=int)
+        out = np.empty((1, batch_size), self.__dtype)
+
+        for start in range(0, m, batch_size):
+            chunk = X[:, start:start + batch_size].astype(self.__dtype,
+                                                          copy=False)
+            z = out[:, :chunk.shape[1]]
+            np.matmul(self.__W, chunk, out=z)
+            z += self.__b
+            if probabilities:
+                # sigmoid function: 1 / (1 + exp(-z))
+                np.negative(z, out=z)
+                np.exp(z, out=z)
+                z += 1
+                np.reciprocal(z, out=z)
+                result[:, start:start + z.shape[1]] = z
+            else:
+                # sigmoid(z) > 0.5 exactly when z > 0
+                np.greater(z, 0, out=result[:, start:start + z.shape[1]],
+                           casting='unsafe')
+        return result
+
     def gradient_descent(self, X, Y, A, alpha=0.05):
         """ Calculate one pass of gradient descent on the neuron
 
@@ -108,7 +198,8 @@ class Neuron:
         self.__b -= alpha * db
 
     def train(self, X, Y, iterations=5000, alpha=0.05,
-              verbose=True, graph=True, step=100):
+              verbose=True, graph=True, step=100, batch_size=None,
+              shuffle=False):
         """Train the neuron: finding the global minuminus of the cost function
 
         Args:
@@ -117,8 +208,17 @@ class Neuron:
             iterations (int, optional): _description_. Defaults to 5000.
             alpha (float, optional): _description_. Defaults to 0.05.
             verbose (bool, optional): _description_. Defaults to True.
-            graph (bool, optional): _description_. Defaults to True.
+            graph (bool or str, optional): show the training curve with
+                                           pyplot, or render it in the
+                                           background to this image path.
+                                           Defaults to True.
             step (int, optional): _description_. Defaults to 100.
+            batch_size (int, optional): number of examples per mini-batch,
+                                        each iteration is then one epoch over
+                                        all the mini-batches. Defaults to None
+                                        (full-batch gradient descent).
+            shuffle (bool, optional): shuffle the mini-batches every epoch.
+                                      Defaults to False.
 
         Raises:
             TypeError: _description_
@@ -137,23 +237,33 @@ class Neuron:
             raise TypeError('alpha must be a float')
         if alpha < 0:
             raise ValueError('alpha must be positive')
+        if batch_size is not None:
+            if not isinstance(batch_size, int):
+                raise TypeError('batch_size must be an integer')
+            if batch_size < 1:
+                raise ValueError('batch_size must be positive')
 
-        costs = []
+        X = X.astype(self.__dtype, copy=False)
+        Y = Y.astype(self.__dtype, copy=False)
+        self.__history = TrainingHistory()
+        m = X.shape[1]
         for i in range(iterations):
 
-            A = self.forward_prop(X)
-            self.gradient_descent(X, Y, A, alpha)
+            cost = 0
+            for batch in batches(m, batch_size, shuffle):
+                X_batch = X[:, batch]
+                Y_batch = Y[:, batch]
+                A = self.forward_prop(X_batch)
+                self.gradient_descent(X_batch, Y_batch, A, alpha)
+                if i % step == 0:
+                    cost += self.cost(Y_batch, A) * Y_batch.shape[1] / m
 
             if verbose and i % step == 0:
-                cost = self.cost(Y, A)
                 print('Cost after {} iterations: {}'.format(i, cost))
-            if graph and i % step == 0:
-                cost = self.cost(Y, A)
-                costs.append(cost)
-        if graph and costs:
-            plt.plot(np.arange(0, iterations, step), costs)
-            plt.xlabel('iteration')
-            plt.ylabel('cost')
-            plt.title('Training Cost')
-            plt.show()
+            if i % step == 0:
+                self.__history.append(i, cost)
+        if isinstance(graph, str):
+            self.__history.render(graph)
+        elif graph and len(self.__history):
+            self.__history.show()
         return self.evaluate(X, Y)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+""" Scaling of data-parallel DeepNeuralNetwork training with the workers
+
+Usage: ./benchmark_data_parallel.py [m] [iterations] [batch_size]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+DeepNeuralNetwork = __import__('28-deep_neural_network').DeepNeuralNetwork
+train_data_parallel = __import__('29-data_parallel').train_data_parallel
+
+
+if __name__ == '__main__':
+    m = int(sys.argv[1]) if len(sys.argv) > 1 else 60000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 8192
+    nx, layers = 784, [128, 64, 10]
+    np.random.seed(0)
+    X = np.random.randn(nx, m) / np.sqrt(nx)
+    Y = np.eye(layers[-1])[np.random.randint(0, layers[-1], m)].T
+
+    np.random.seed(1)
+    network = DeepNeuralNetwork(nx, layers)
+    start = time.perf_counter()
+    network.train(X, Y, iterations=iterations, batch_size=batch_size,
+                  verbose=False, graph=False)
+    baseline = time.perf_counter() - start
+    print('{:<20} {:>10} {:>12} {:>8}'.format(
+        'trainer', 'seconds', 'examples/s', 'speedup'))
+    print('{:<20} {:>10.3f} {:>12.0f} {:>7.2f}x'.format(
+        'train()', baseline, m * iterations / baseline, 1))
+
+    workers = 1
+    while workers <= os.cpu_count():
+        np.random.seed(1)
+        network = DeepNeuralNetwork(nx, layers)
+        start = time.perf_counter()
+        train_data_parallel(network, X, Y, iterations=iterations,
+                            batch_size=batch_size, workers=workers,
+                            verbose=False)
+        seconds = time.perf_counter() - start
+        print('{:<20} {:>10.3f} {:>12.0f} {:>7.2f}x'.format(
+            '{} worker(s)'.format(workers), seconds,
+            m * iterations / seconds, baseline / seconds))
+        workers *= 2
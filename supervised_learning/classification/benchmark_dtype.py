@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+""" Training throughput of the classification models in float32 and float64
+
+Usage: ./benchmark_dtype.py [m] [iterations]
+"""
+
+import sys
+import time
+
+import numpy as np
+Neuron = __import__('7-neuron').Neuron
+NeuralNetwork = __import__('15-neural_network').NeuralNetwork
+DeepNeuralNetwork = __import__('28-deep_neural_network').DeepNeuralNetwork
+
+
+def benchmark(make_model, X, Y, iterations):
+    """ Time the training of one model
+
+    Args:
+        make_model (callable): builds the model for a given dtype
+        X (numpy.array): input data, already in the model dtype
+        Y (numpy.array): labels, already in the model dtype
+        iterations (int): number of training iterations
+
+    Returns:
+        float: throughput in examples per second
+    """
+    model = make_model()
+    start = time.perf_counter()
+    model.train(X, Y, iterations=iterations, alpha=0.05,
+                verbose=False, graph=False)
+    return X.shape[1] * iterations / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    m = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    nx, classes = 784, 10
+    np.random.seed(0)
+    X = np.random.randn(nx, m) / np.sqrt(nx)
+    labels = np.random.randint(0, classes, m)
+    Y_bin = (labels == 0).astype(float).reshape(1, m)
+    Y_hot = np.eye(classes)[labels].T
+
+    models = [
+        ('Neuron', lambda dt: Neuron(nx, dtype=dt), Y_bin),
+        ('NeuralNetwork', lambda dt: NeuralNetwork(nx, 64, dtype=dt), Y_bin),
+        ('DeepNeuralNetwork',
+         lambda dt: DeepNeuralNetwork(nx, [256, 128, classes], dtype=dt),
+         Y_hot),
+        ('DeepNeuralNetwork (preallocate)',
+         lambda dt: DeepNeuralNetwork(nx, [256, 128, classes], dtype=dt,
+                                      preallocate=True),
+         Y_hot),
+    ]
+    print('{:<32} {:>14} {:>14} {:>8}'.format(
+        'model', 'float64 ex/s', 'float32 ex/s', 'speedup'))
+    for name, make, Y in models:
+        rates = []
+        for dtype in (np.float64, np.float32):
+            rates.append(benchmark(lambda: make(dtype), X.astype(dtype),
+                                   Y.astype(dtype), iterations))
+        print('{:<32} {:>14.0f} {:>14.0f} {:>7.2f}x'.format(
+            name, rates[0], rates[1], rates[1] / rates[0]))
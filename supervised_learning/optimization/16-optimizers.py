@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+""" Stateful optimizers updating numpy variables in place
+"""
+
+import numpy as np
+
+
+class GradientDescent:
+    """ Plain gradient descent, the stateless baseline of the optimizers
+
+    Every optimizer exposes update(key, var, grad), which updates var in
+    place; key identifies the variable so that its moments are kept
+    between calls (for DeepNeuralNetwork, 'W1', 'b1', ...).
+    """
+
+    def __init__(self, alpha=0.05):
+        """
+        Args:
+            alpha (float): learning rate
+        """
+        self.alpha = alpha
+        self.state = {}
+
+    def _buffers(self, key, var, count):
+        """ Return the buffers kept for a variable, creating them once
+
+        Args:
+            key (hashable): identifier of the variable
+            var (np.ndarray): variable the buffers are shaped like
+            count (int): number of buffers; the first ones are zeroed
+                moments and the last one is scratch space
+        Returns:
+            list: the buffers of the variable
+        """
+        buffers = self.state.get(key)
+        if buffers is None:
+            buffers = [np.zeros_like(var) for _ in range(count)]
+            self.state[key] = buffers
+        return buffers
+
+    def update(self, key, var, grad):
+        """ Updates a variable in place
+
+        Args:
+            key (hashable): identifier of the variable
+            var (np.ndarray): variable to be updated
+            grad (np.ndarray): gradient of var
+        """
+        tmp, = self._buffers(key, var, 1)
+        np.multiply(grad, self.alpha, out=tmp)
+        var -= tmp
+
+
+class Momentum(GradientDescent):
+    """ Gradient descent with momentum, see 5-momentum.py
+    """
+
+    def __init__(self, alpha=0.05, beta1=0.9):
+        """
+        Args:
+            alpha (float): learning rate
+            beta1 (float): momentum weight
+        """
+        super().__init__(alpha)
+        self.beta1 = beta1
+
+    def update(self, key, var, grad):
+        """ Updates a variable in place
+
+        Args:
+            key (hashable): identifier of the variable
+            var (np.ndarray): variable to be updated
+            grad (np.ndarray): gradient of var
+        """
+        v, tmp = self._buffers(key, var, 2)
+        # v = beta1 * v + (1 - beta1) * grad
+        v *= self.beta1
+        np.multiply(grad, 1 - self.beta1, out=tmp)
+        v += tmp
+        # var = var - alpha * v
+        np.multiply(v, self.alpha, out=tmp)
+        var -= tmp
+
+
+class RMSProp(GradientDescent):
+    """ RMSProp optimization, see 7-RMSProp.py
+    """
+
+    def __init__(self, alpha=0.001, beta2=0.9, epsilon=1e-8):
+        """
+        Args:
+            alpha (float): learning rate
+            beta2 (float): RMSProp weight
+            epsilon (float): small number to avoid division by zero
+        """
+        super().__init__(alpha)
+        self.beta2 = beta2
+        self.epsilon = epsilon
+
+    def update(self, key, var, grad):
+        """ Updates a variable in place
+
+        Args:
+            key (hashable): identifier of the variable
+            var (np.ndarray): variable to be updated
+            grad (np.ndarray): gradient of var
+        """
+        s, tmp = self._buffers(key, var, 2)
+        # s = beta2 * s + (1 - beta2) * grad ** 2
+        s *= self.beta2
+        np.square(grad, out=tmp)
+        tmp *= 1 - self.beta2
+        s += tmp
+        # var = var - alpha * grad / (sqrt(s) + epsilon)
+        np.sqrt(s, out=tmp)
+        tmp += self.epsilon
+        np.divide(grad, tmp, out=tmp)
+        tmp *= self.alpha
+        var -= tmp
+
+
+class Adam(GradientDescent):
+    """ Adam optimization, see 9-Adam.py
+    """
+
+    def __init__(self, alpha=0.001, beta1=0.9, beta2=0.999, epsilon=1e-8):
+        """
+        Args:
+            alpha (float): learning rate
+            beta1 (float): weight used for the first moment
+            beta2 (float): weight used for the second moment
+            epsilon (float): small number to avoid division by zero
+        """
+        super().__init__(alpha)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.t = {}
+
+    def update(self, key, var, grad):
+        """ Updates a variable in place
+
+        Args:
+            key (hashable): identifier of the variable
+            var (np.ndarray): variable to be updated
+            grad (np.ndarray): gradient of var
+        """
+        v, s, tmp = self._buffers(key, var, 3)
+        t = self.t.get(key, 0) + 1
+        self.t[key] = t
+        # v = beta1 * v + (1 - beta1) * grad
+        v *= self.beta1
+        np.multiply(grad, 1 - self.beta1, out=tmp)
+        v += tmp
+        # s = beta2 * s + (1 - beta2) * grad ** 2
+        s *= self.beta2
+        np.square(grad, out=tmp)
+        tmp *= 1 - self.beta2
+        s += tmp
+        # var = var - alpha * v_corrected / (sqrt(s_corrected) + epsilon),
+        # with the bias corrections folded into two scalars
+        np.sqrt(s, out=tmp)
+        tmp *= 1 / np.sqrt(1 - self.beta2 ** t)
+        tmp += self.epsilon
+        np.divide(v, tmp, out=tmp)
+        tmp *= self.alpha / (1 - self.beta1 ** t)
+        var -= tmp
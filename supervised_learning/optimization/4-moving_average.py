@@ -1,14 +1,93 @@
 #!/usr/bin/env python3
 """ Moving average"""
+import math
+
 import numpy as np
+from scipy.signal import lfilter
+
+
+def _moving_average(data, beta, v=0.0, t=0):
+    """ Bias corrected moving average of data, resuming from v after t steps
+
+    v_t = beta * v_(t-1) + (1 - beta) * x_t is a first order IIR filter,
+    run by lfilter in C. The bias correction 1 - beta ** t rounds to 1
+    after a few hundred steps, so only that head of the output is divided.
+
+    Returns:
+        tuple: the averages as a float64 array and the last v
+    """
+    data = np.asarray(data, dtype=np.float64)
+    if data.size == 0:
+        return data.copy(), v
+    averages, _ = lfilter([1 - beta], [1, -beta], data, zi=[beta * v])
+    v = float(averages[-1])
+    if 0 < beta < 1:
+        # from this step on, beta ** step is below half an ulp of 1
+        end = math.ceil(math.log(np.finfo(np.float64).eps / 2) /
+                        math.log(beta)) - t
+    else:
+        end = data.size
+    end = min(max(end, 0), data.size)
+    steps = np.arange(t + 1, t + 1 + end)
+    averages[:end] /= 1 - np.power(beta, steps, dtype=np.float64)
+    return averages, v
 
 
 def moving_average(data, beta):
-    """ moving average"""
-    v = 0
-    result = []
-    for x in range(len(data)):
-        v = beta * v + (1 - beta) * data[x]
-        b = 1 - (beta ** (x + 1))
-        result.append(v / b)
-    return result
+    """ moving average
+
+    Args:
+        data (array_like): values to average
+        beta (float): weight of the previous average
+
+    Returns:
+        numpy.ndarray: bias corrected moving average of each value
+    """
+    return _moving_average(data, beta)[0]
+
+
+class MovingAverage:
+    """ Streaming moving average carrying v between chunks
+
+    Feeding the chunks of data one after the other to update gives the
+    same values as moving_average on the whole data.
+    """
+
+    def __init__(self, beta):
+        """ Start an empty average
+
+        Args:
+            beta (float): weight of the previous average
+        """
+        self.__beta = beta
+        self.__v = 0.0
+        self.__t = 0
+
+    @property
+    def beta(self):
+        """ Return the weight of the previous average """
+        return self.__beta
+
+    @property
+    def v(self):
+        """ Return the uncorrected average after the last value """
+        return self.__v
+
+    @property
+    def t(self):
+        """ Return the number of values seen """
+        return self.__t
+
+    def update(self, chunk):
+        """ Average the next chunk of values
+
+        Args:
+            chunk (array_like): values following the previous chunks
+
+        Returns:
+            numpy.ndarray: bias corrected moving average of each value
+        """
+        averages, self.__v = _moving_average(chunk, self.__beta, self.__v,
+                                             self.__t)
+        self.__t += averages.size
+        return averages